@@ -138,7 +138,10 @@ async def main():
     )
     
     print(f"✓ Adherence report generated:")
-    print(f"   Score: {adherence_report['adherence_score'] * 100:.1f}%")
+    if adherence_report['adherence_score'] is not None:
+        print(f"   Score: {adherence_report['adherence_score'] * 100:.1f}%")
+    else:
+        print("   Score: no refill history available")
     print(f"   Medications tracked: {adherence_report['medications_tracked']}")
     
     # Example 7: Schedule appointment
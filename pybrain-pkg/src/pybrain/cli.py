@@ -4,6 +4,7 @@ Command-line interface for PyBrain
 
 import click
 import logging
+import orjson
 from typing import Optional
 from pybrain.core.ai import AIEngine, ModelConfig
 from pybrain.core.harmonizer import DataHarmonizer
@@ -50,14 +51,13 @@ def harmonize(input, format, resource, output):
     harmonizer = DataHarmonizer()
     
     # Read input data
-    import json
-    data = json.load(input)
+    data = orjson.loads(input.read())
     
     # Harmonize to FHIR
     fhir_resource = harmonizer.harmonize_to_fhir(data, format, resource)
     
     if fhir_resource:
-        result = json.dumps(fhir_resource, indent=2)
+        result = orjson.dumps(fhir_resource, option=orjson.OPT_INDENT_2).decode()
         if output:
             output.write(result)
         else:
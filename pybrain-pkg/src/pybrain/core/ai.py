@@ -165,60 +165,106 @@ class AIEngine:
     
     def predict_readmission_risk(self, patient_history: Dict[str, Any]) -> float:
         """Predict 30-day readmission risk"""
+        return self._readmission_risk(self._risk_features(patient_history))
+    
+    def predict_fall_risk(self, patient_history: Dict[str, Any]) -> float:
+        """Predict fall risk"""
+        return self._fall_risk(self._risk_features(patient_history))
+    
+    def predict_adherence_risk(self, patient_history: Dict[str, Any]) -> float:
+        """Predict medication adherence risk"""
+        return self._adherence_risk(self._risk_features(patient_history))
+    
+    def predict_clinical_deterioration(self, patient_history: Dict[str, Any]) -> float:
+        """Predict clinical deterioration risk"""
+        return self._deterioration_risk(self._risk_features(patient_history))
+    
+    def predict_all_risks(self, patient_history: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Predict all patient risks at once
+        
+        Features are extracted from the history a single time and shared by
+        every prediction.
+        
+        Args:
+            patient_history: Patient history with demographics, conditions,
+                medications, observations and encounters
+            
+        Returns:
+            Readmission, fall, medication adherence and deterioration risks
+        """
+        features = self._risk_features(patient_history)
+        return {
+            "readmission_risk": self._readmission_risk(features),
+            "fall_risk": self._fall_risk(features),
+            "medication_adherence_risk": self._adherence_risk(features),
+            "deterioration_risk": self._deterioration_risk(features)
+        }
+    
+    def _risk_features(self, patient_history: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract the features used by the risk predictions"""
+        demographics = patient_history.get("demographics", {})
+        return {
+            "age": demographics.get("age", 0),
+            "admissions": len(patient_history.get("encounters", [])),
+            "conditions": [str(condition).lower()
+                           for condition in patient_history.get("conditions", [])],
+            "medications": [str(med).lower()
+                            for med in patient_history.get("medications", [])],
+            "recent_observations": patient_history.get("observations", [])[-10:]
+        }
+    
+    def _readmission_risk(self, features: Dict[str, Any]) -> float:
+        """30-day readmission risk from extracted features"""
         base_risk = 0.1  # 10% baseline
         
         # Previous admissions
-        admissions = len(patient_history.get("encounters", []))
+        admissions = features["admissions"]
         if admissions > 3:
             base_risk += 0.2
         elif admissions > 1:
             base_risk += 0.1
         
         # Chronic conditions
-        conditions = patient_history.get("conditions", [])
         chronic_conditions = ["diabetes", "heart failure", "copd", "kidney disease"]
-        for condition in conditions:
-            if any(cc in str(condition).lower() for cc in chronic_conditions):
+        for condition in features["conditions"]:
+            if any(cc in condition for cc in chronic_conditions):
                 base_risk += 0.15
         
         return min(base_risk, 1.0)
     
-    def predict_fall_risk(self, patient_history: Dict[str, Any]) -> float:
-        """Predict fall risk"""
+    def _fall_risk(self, features: Dict[str, Any]) -> float:
+        """Fall risk from extracted features"""
         risk = 0.05  # 5% baseline
         
         # Age factor
-        demographics = patient_history.get("demographics", {})
-        age = demographics.get("age", 0)
+        age = features["age"]
         if age > 75:
             risk += 0.3
         elif age > 65:
             risk += 0.2
         
         # Medications that increase fall risk
-        medications = patient_history.get("medications", [])
         fall_risk_meds = ["sedative", "antipsychotic", "benzodiazepine"]
-        for med in medications:
-            med_str = str(med).lower()
-            if any(frm in med_str for frm in fall_risk_meds):
+        for med in features["medications"]:
+            if any(frm in med for frm in fall_risk_meds):
                 risk += 0.1
         
         return min(risk, 1.0)
     
-    def predict_adherence_risk(self, patient_history: Dict[str, Any]) -> float:
-        """Predict medication adherence risk"""
+    def _adherence_risk(self, features: Dict[str, Any]) -> float:
+        """Medication adherence risk from extracted features"""
         risk = 0.2  # 20% baseline non-adherence
         
         # Multiple medications increase non-adherence
-        medications = patient_history.get("medications", [])
-        if len(medications) > 5:
+        medication_count = len(features["medications"])
+        if medication_count > 5:
             risk += 0.2
-        elif len(medications) > 3:
+        elif medication_count > 3:
             risk += 0.1
         
         # Age factors
-        demographics = patient_history.get("demographics", {})
-        age = demographics.get("age", 0)
+        age = features["age"]
         if age > 75:
             risk += 0.15  # Cognitive decline risk
         elif age < 30:
@@ -226,15 +272,14 @@ class AIEngine:
         
         return min(risk, 1.0)
     
-    def predict_clinical_deterioration(self, patient_history: Dict[str, Any]) -> float:
-        """Predict clinical deterioration risk"""
+    def _deterioration_risk(self, features: Dict[str, Any]) -> float:
+        """Clinical deterioration risk from extracted features"""
         risk = 0.05  # 5% baseline
         
         # Recent vital signs
-        observations = patient_history.get("observations", [])
         abnormal_vitals = 0
         
-        for obs in observations[-10:]:  # Last 10 observations
+        for obs in features["recent_observations"]:
             # Simplified vital signs analysis
             value = obs.get("value", 0)
             code = str(obs.get("code", "")).lower()
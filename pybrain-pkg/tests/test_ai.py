@@ -37,6 +37,28 @@ def test_risk_score_prediction():
     assert risk_score > 0.3  # Should be elevated due to age and conditions
 
 
+def test_predict_all_risks():
+    """Test combined risk prediction matches the individual predictions."""
+    engine = AIEngine()
+    history = {
+        "demographics": {"age": 80},
+        "conditions": ["Type 2 diabetes", "Heart failure"],
+        "medications": ["Sedative", "Metformin", "Lisinopril", "Aspirin"],
+        "observations": [{"code": "Heart rate", "value": 120}] * 3,
+        "encounters": [{}, {}]
+    }
+    
+    risks = engine.predict_all_risks(history)
+    assert risks == {
+        "readmission_risk": engine.predict_readmission_risk(history),
+        "fall_risk": engine.predict_fall_risk(history),
+        "medication_adherence_risk": engine.predict_adherence_risk(history),
+        "deterioration_risk": engine.predict_clinical_deterioration(history)
+    }
+    assert risks["readmission_risk"] == pytest.approx(0.5)
+    assert risks["deterioration_risk"] == pytest.approx(0.2)
+
+
 def test_model_config():
     """Test model configuration."""
     config = ModelConfig(
@@ -9,16 +9,14 @@ __version__ = "0.1.0"
 __author__ = "BrainSAIT Healthcare Innovation Lab"
 __email__ = "healthcare@brainsait.com"
 
-from pyheart.core.client import FHIRClient, HealthcareClient
-from pyheart.core.server import FHIRServer, APIGateway
-from pyheart.core.workflow import WorkflowEngine, ProcessDefinition
+from pyheart.core._lazy import lazy_exports
+from pyheart.core.workflow import WorkflowEngine, ProcessDefinition, get_workflow_engine
 from pyheart.core.integration import IntegrationHub, Adapter
 from pyheart.core.security import SecurityManager, AuthProvider
 from pyheart.core.plugins import (
     Plugin, PluginManager, PluginRegistry, PluginType, 
     PluginMetadata, get_plugin_manager
 )
-from pyheart.plugins import InsuranceAdapter, GovernmentAdapter, ProviderAdapter
 
 __all__ = [
     "FHIRClient",
@@ -27,6 +25,7 @@ __all__ = [
     "APIGateway",
     "WorkflowEngine",
     "ProcessDefinition",
+    "get_workflow_engine",
     "IntegrationHub",
     "Adapter",
     "SecurityManager",
@@ -42,6 +41,23 @@ __all__ = [
     "ProviderAdapter",
 ]
 
+
+# Exports resolved on first access: the client and server pull in pydantic and
+# FastAPI, and the plugin adapters their own modules, which most importers of
+# pyheart (plugins, workers, tests) never use
+_LAZY_EXPORTS = {
+    "FHIRClient": "pyheart.core.client",
+    "HealthcareClient": "pyheart.core.client",
+    "FHIRServer": "pyheart.core.server",
+    "APIGateway": "pyheart.core.server",
+    "InsuranceAdapter": "pyheart.plugins",
+    "GovernmentAdapter": "pyheart.plugins",
+    "ProviderAdapter": "pyheart.plugins",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _LAZY_EXPORTS)
+
+
 # Configure structured logging
 import structlog
 
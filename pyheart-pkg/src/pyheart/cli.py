@@ -4,16 +4,31 @@ Command-line interface for PyHeart
 
 import click
 import asyncio
-import json
-from typing import Optional
+import orjson
+from typing import Any, Dict, Iterator, Optional, Tuple
 from rich.console import Console
 from rich.table import Table
 from pyheart.core.client import FHIRClient, ClientConfig
-from pyheart.core.workflow import WorkflowEngine, ProcessDefinition
+from pyheart.core.workflow import ProcessDefinition, TaskStatus, get_workflow_engine
 
 console = Console()
 
 
+def _bundle_rows(bundle: Dict[str, Any]) -> Iterator[Tuple[str, str, str]]:
+    """Yield (id, type, last updated) display rows for the resources in a search bundle"""
+    for entry in bundle.get("entry") or ():
+        resource = entry.get("resource")
+        if not resource:
+            continue
+        
+        meta = resource.get("meta") or {}
+        yield (
+            resource.get("id", "N/A"),
+            resource.get("resourceType", "N/A"),
+            meta.get("lastUpdated", "N/A")
+        )
+
+
 @click.group()
 @click.version_option()
 def main():
@@ -45,12 +60,12 @@ def fhir(server: str, token: Optional[str], resource: str, id: Optional[str], se
             result = client.search(f"{resource}/{id}")
         
         if result:
-            console.print_json(json.dumps(result, indent=2))
+            console.print_json(orjson.dumps(result).decode())
         else:
             console.print(f"[red]Resource not found: {resource}/{id}")
     else:
         # Search resources
-        params = json.loads(search) if search else {}
+        params = orjson.loads(search) if search else {}
         console.print(f"[blue]Searching {resource} with params: {params}")
         
         bundle = client.search(resource, params)
@@ -59,51 +74,64 @@ def fhir(server: str, token: Optional[str], resource: str, id: Optional[str], se
         table = Table(title=f"{resource} Search Results")
         table.add_column("ID", style="cyan")
         table.add_column("Type", style="magenta")
+        table.add_column("Last Updated", style="green")
         
-        if bundle.get("entry"):
-            for entry in bundle["entry"]:
-                resource_data = entry.get("resource", {})
-                table.add_row(
-                    resource_data.get("id", "N/A"),
-                    resource_data.get("resourceType", "N/A")
-                )
+        for row in _bundle_rows(bundle):
+            table.add_row(*row)
         
         console.print(table)
         console.print(f"\n[green]Total results: {bundle.get('total', 0)}")
 
 
 @main.command()
-@click.option('--file', '-f', type=click.File('r'), required=True, help='Workflow definition file')
+@click.option('--file', '-f', 'files', type=click.File('rb'), required=True, multiple=True,
+              help='Workflow definition file (may be given multiple times)')
 @click.option('--variables', '-v', help='Initial variables as JSON')
-def workflow(file, variables: Optional[str]):
+def workflow(files, variables: Optional[str]):
     """Execute healthcare workflows"""
-    # Load workflow definition
-    workflow_def = json.load(file)
-    process = ProcessDefinition(**workflow_def)
+    # Reuse one engine so every definition is registered and compiled once
+    engine = get_workflow_engine()
     
-    # Create workflow engine
-    engine = WorkflowEngine()
-    engine.register_process(process)
+    # Load workflow definitions
+    processes = []
+    for file in files:
+        process = ProcessDefinition.model_validate_json(file.read())
+        engine.register_process(process)
+        processes.append(process)
     
     # Parse variables
-    vars = json.loads(variables) if variables else {}
-    
-    console.print(f"[green]Starting workflow: {process.name}")
-    console.print(f"[blue]Process ID: {process.id}")
+    vars = orjson.loads(variables) if variables else {}
     
     # Start workflow
-    async def run_workflow():
+    async def run_workflow(process: ProcessDefinition):
+        console.print(f"[green]Starting workflow: {process.name}")
+        console.print(f"[blue]Process ID: {process.id}")
+        
         instance_id = await engine.start_process(process.id, vars)
         console.print(f"[yellow]Instance ID: {instance_id}")
         
-        # Wait a bit for execution
-        await asyncio.sleep(2)
+        # Wait for execution to finish, for at most two seconds
+        total = len(process.tasks)
+        with console.status("[bold green]Running workflow...") as status:
+            for _ in range(20):
+                instance = engine.get_instance_status(instance_id)
+                if instance is None or instance.is_finished():
+                    break
+                completed = instance.count_tasks(TaskStatus.COMPLETED)
+                status.update(
+                    f"[bold green]Running workflow... {completed}/{total} tasks completed"
+                )
+                await asyncio.sleep(0.1)
         
-        instance = engine.get_instance_status(instance_id)
         if instance:
             console.print(f"\n[bold]Workflow Status: {instance.status}")
+            console.print(f"Tasks completed: {instance.count_tasks(TaskStatus.COMPLETED)}/{total}")
+    
+    async def run_all():
+        for process in processes:
+            await run_workflow(process)
     
-    asyncio.run(run_workflow())
+    asyncio.run(run_all())
 
 
 @main.command()
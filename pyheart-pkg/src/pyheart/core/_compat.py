@@ -0,0 +1,9 @@
+"""
+Compatibility shims for the supported Python versions
+"""
+
+from typing import Any, Dict
+import sys
+
+# ``slots=True`` is only understood by dataclasses on Python 3.10+
+DATACLASS_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
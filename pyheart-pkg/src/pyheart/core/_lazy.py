@@ -0,0 +1,38 @@
+"""
+Lazy package exports (PEP 562)
+"""
+
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+import importlib
+
+
+def lazy_exports(
+    module_name: str,
+    module_globals: Dict[str, Any],
+    exports: Mapping[str, str],
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build module __getattr__ and __dir__ hooks that import exports on first access
+    
+    Args:
+        module_name: __name__ of the exporting module
+        module_globals: The module's globals(); resolved names are cached there
+            so later lookups skip the hook
+        exports: Exported name -> module it is imported from
+    
+    Returns:
+        (__getattr__, __dir__) for the exporting module
+    """
+    def __getattr__(name: str) -> Any:
+        source = exports.get(name)
+        if source is None:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        
+        value = getattr(importlib.import_module(source), name)
+        module_globals[name] = value
+        return value
+    
+    def __dir__() -> List[str]:
+        return sorted(set(module_globals) | set(exports))
+    
+    return __getattr__, __dir__
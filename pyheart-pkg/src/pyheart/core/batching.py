@@ -0,0 +1,139 @@
+"""
+Micro-batching of concurrent submissions
+"""
+
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+import asyncio
+import structlog
+
+logger = structlog.get_logger()
+
+# Queued by stop() to tell the drainer to flush its batch and exit
+_STOP = object()
+
+
+class BatchQueue:
+    """
+    Coalesce concurrent submissions into batches handled by one callback
+    
+    Callers await submit() for a single item; a background drainer groups
+    queued items into batches of at most max_batch, holding a batch open for
+    up to max_wait_ms. Busy periods therefore produce larger batches on their
+    own, while a lone item waits no longer than max_wait_ms.
+    """
+    
+    def __init__(self, handler: Callable[[List[Any]], Awaitable[List[Any]]],
+                 max_batch: int = 50,
+                 max_wait_ms: float = 20):
+        """
+        Args:
+            handler: Coroutine function taking a batch of items and returning
+                one result per item, in the same order
+            max_batch: Largest number of items handed to the handler at once
+            max_wait_ms: How long a batch is held open for more items
+        """
+        self.handler = handler
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self._queue: Optional[asyncio.Queue] = None
+        self._drainer: Optional[asyncio.Task] = None
+    
+    @property
+    def running(self) -> bool:
+        """Whether the background drainer is accepting submissions"""
+        return self._drainer is not None
+    
+    def start(self) -> None:
+        """Start the background drainer on the running event loop"""
+        if self._drainer is None:
+            self._queue = asyncio.Queue()
+            self._drainer = asyncio.get_running_loop().create_task(self._drain(self._queue))
+    
+    async def stop(self) -> None:
+        """
+        Stop the drainer once everything already submitted has been handled
+        
+        Items submitted after stop() is called are handled on their own.
+        """
+        if self._drainer is None:
+            return
+        
+        queue, drainer = self._queue, self._drainer
+        self._queue = None
+        self._drainer = None
+        
+        # The sentinel queues behind every pending item, so the drainer
+        # flushes them all, including a batch it is still filling or handling
+        await queue.put(_STOP)
+        await drainer
+    
+    async def submit(self, item: Any) -> Any:
+        """
+        Submit one item and wait for its result
+        
+        When the drainer is not running the item is handled on its own.
+        """
+        if self._queue is None:
+            return (await self.handler([item]))[0]
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+    
+    async def _drain(self, queue: asyncio.Queue) -> None:
+        """
+        Background task that groups queued items into batches
+        
+        Takes the queue as an argument because stop() detaches it from self.
+        """
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            entry = await queue.get()
+            if entry is _STOP:
+                return
+            batch = [entry]
+            stopping = False
+            
+            # Take whatever is already waiting, then hold the batch open briefly
+            deadline = loop.time() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch:
+                if not queue.empty():
+                    entry = queue.get_nowait()
+                else:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        entry = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+            
+            await self._flush(batch)
+            if stopping:
+                return
+    
+    async def _flush(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        """Run the handler on a batch and hand each caller its own result"""
+        try:
+            results = await self.handler([item for item, _ in batch])
+            if results is None or len(results) != len(batch):
+                raise ValueError(
+                    f"Batch handler returned {0 if results is None else len(results)} "
+                    f"results for {len(batch)} items"
+                )
+        except Exception as e:
+            logger.error("Batch handler failed", size=len(batch), error=str(e))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,151 @@
+"""
+In-memory response caching for adapters
+"""
+
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+import asyncio
+import time
+
+_MISSING = object()
+
+
+def params_key(resource_type: str, params: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+    """
+    Build a cache key for a fetch request
+    
+    Args:
+        resource_type: Requested resource type
+        params: Query parameters
+    
+    Returns:
+        Hashable key, or None if the parameters cannot be hashed (such
+        requests are not cached)
+    """
+    key = (resource_type, tuple(sorted(params.items())))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one
+    
+    While a call for a key is in flight, further callers for that key await
+    its result instead of starting their own. Nothing is kept once the call
+    finishes; results are shared between callers, so copy before mutating.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+    
+    def __len__(self) -> int:
+        return len(self._calls)
+    
+    async def do(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fetch for key, or join the call already in flight for it
+        
+        Args:
+            key: Request key
+            fetch: Coroutine function producing the value
+            
+        Returns:
+            The shared result
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        
+        # Shield so one caller being cancelled doesn't cancel the shared call
+        return await asyncio.shield(task)
+    
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        """Drop a finished call unless a newer one has taken its key"""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+
+class TTLCache:
+    """
+    Least-recently-used cache whose entries expire after a fixed time
+    
+    get_or_fetch() also coalesces concurrent misses for the same key, so a
+    burst of identical requests results in a single upstream call. Cached
+    values are returned as-is and shared between callers; copy them before
+    mutating.
+    """
+    
+    def __init__(self, maxsize: int = 10_000, ttl: float = 300):
+        """
+        Args:
+            maxsize: Largest number of entries kept before evicting the least
+                recently used
+            ttl: Seconds an entry stays valid
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight = SingleFlight()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live entry, or default if it is missing or expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._data[key]
+            return default
+        
+        self._data.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store an entry, evicting the least recently used ones beyond maxsize"""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry"""
+        self._data.pop(key, None)
+    
+    def clear(self) -> None:
+        """Drop all entries"""
+        self._data.clear()
+    
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for key, fetching it on a miss
+        
+        Concurrent misses for the same key share one fetch. Failures are not
+        cached.
+        
+        Args:
+            key: Cache key
+            fetch: Coroutine function producing the value
+        
+        Returns:
+            Cached or freshly fetched value
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        
+        async def load() -> Any:
+            value = await fetch()
+            self.set(key, value)
+            return value
+        
+        return await self._inflight.do(key, load)
@@ -6,6 +6,7 @@ from typing import Any, Dict, List, Optional, Union
 from datetime import datetime
 import httpx
 import asyncio
+import orjson
 from pydantic import BaseModel, Field, HttpUrl
 import structlog
 from tenacity import retry, stop_after_attempt, wait_exponential
@@ -13,6 +14,19 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 logger = structlog.get_logger()
 
 
+def _decode(response: httpx.Response) -> Dict[str, Any]:
+    """Parse a FHIR JSON response body"""
+    return orjson.loads(response.content)
+
+
+def _next_link(bundle: Dict[str, Any]) -> Optional[str]:
+    """Return the URL of a search bundle's next page, if it has one"""
+    for link in bundle.get("link") or ():
+        if link.get("relation") == "next":
+            return link.get("url")
+    return None
+
+
 class ClientConfig(BaseModel):
     """Configuration for FHIR client"""
     
@@ -22,6 +36,13 @@ class ClientConfig(BaseModel):
     timeout: int = Field(default=30, description="Request timeout in seconds")
     max_retries: int = Field(default=3, description="Maximum retry attempts")
     verify_ssl: bool = Field(default=True, description="Verify SSL certificates")
+    max_connections: int = Field(default=100, description="Maximum pooled connections")
+    max_keepalive_connections: int = Field(
+        default=20, description="Idle connections kept open for reuse"
+    )
+    keepalive_expiry: float = Field(
+        default=60.0, description="Seconds an idle connection is kept open"
+    )
 
 
 class FHIRClient:
@@ -50,7 +71,8 @@ class FHIRClient:
             base_url=str(self.config.base_url),
             headers=headers,
             timeout=self.config.timeout,
-            verify=self.config.verify_ssl
+            verify=self.config.verify_ssl,
+            limits=self._get_limits()
         )
     
     def _create_async_client(self) -> httpx.AsyncClient:
@@ -60,7 +82,16 @@ class FHIRClient:
             base_url=str(self.config.base_url),
             headers=headers,
             timeout=self.config.timeout,
-            verify=self.config.verify_ssl
+            verify=self.config.verify_ssl,
+            limits=self._get_limits()
+        )
+    
+    def _get_limits(self) -> httpx.Limits:
+        """Get connection pool limits, shared by all requests of a client"""
+        return httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_keepalive_connections,
+            keepalive_expiry=self.config.keepalive_expiry
         )
     
     def _get_headers(self) -> Dict[str, str]:
@@ -95,7 +126,7 @@ class FHIRClient:
         try:
             response = self._client.get(f"Patient/{patient_id}")
             response.raise_for_status()
-            return response.json()
+            return _decode(response)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 logger.info("Patient not found", patient_id=patient_id)
@@ -115,7 +146,7 @@ class FHIRClient:
         try:
             response = await self._async_client.get(f"Patient/{patient_id}")
             response.raise_for_status()
-            return response.json()
+            return _decode(response)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 return None
@@ -139,7 +170,7 @@ class FHIRClient:
         try:
             response = self._client.get(resource_type, params=params)
             response.raise_for_status()
-            return response.json()
+            return _decode(response)
         except Exception as e:
             logger.error("Search failed",
                         resource_type=resource_type,
@@ -156,7 +187,7 @@ class FHIRClient:
         try:
             response = await self._async_client.get(resource_type, params=params)
             response.raise_for_status()
-            return response.json()
+            return _decode(response)
         except Exception as e:
             logger.error("Async search failed",
                         resource_type=resource_type,
@@ -164,6 +195,42 @@ class FHIRClient:
                         error=str(e))
             raise
     
+    def next_page(self, bundle: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the next page of search results
+        
+        Args:
+            bundle: Bundle returned by search() or a previous next_page()
+            
+        Returns:
+            Bundle with the next page, or None if bundle is the last page
+        """
+        url = _next_link(bundle)
+        if url is None:
+            return None
+        
+        try:
+            response = self._client.get(url)
+            response.raise_for_status()
+            return _decode(response)
+        except Exception as e:
+            logger.error("Next page fetch failed", url=url, error=str(e))
+            raise
+    
+    async def next_page_async(self, bundle: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Async version of next_page"""
+        url = _next_link(bundle)
+        if url is None:
+            return None
+        
+        try:
+            response = await self._async_client.get(url)
+            response.raise_for_status()
+            return _decode(response)
+        except Exception as e:
+            logger.error("Async next page fetch failed", url=url, error=str(e))
+            raise
+    
     def create(self, resource: Dict[str, Any]) -> Dict[str, Any]:
         """
         Create a new resource
@@ -181,10 +248,10 @@ class FHIRClient:
         try:
             response = self._client.post(
                 resource_type,
-                json=resource
+                content=orjson.dumps(resource)
             )
             response.raise_for_status()
-            return response.json()
+            return _decode(response)
         except Exception as e:
             logger.error("Failed to create resource",
                         resource_type=resource_type,
@@ -200,10 +267,10 @@ class FHIRClient:
         try:
             response = await self._async_client.post(
                 resource_type,
-                json=resource
+                content=orjson.dumps(resource)
             )
             response.raise_for_status()
-            return response.json()
+            return _decode(response)
         except Exception as e:
             logger.error("Failed to create resource async",
                         resource_type=resource_type,
@@ -221,10 +288,10 @@ class FHIRClient:
         try:
             response = self._client.put(
                 f"{resource_type}/{resource_id}",
-                json=resource
+                content=orjson.dumps(resource)
             )
             response.raise_for_status()
-            return response.json()
+            return _decode(response)
         except Exception as e:
             logger.error("Failed to update resource",
                         resource_type=resource_type,
@@ -246,9 +313,9 @@ class FHIRClient:
     def batch(self, bundle: Dict[str, Any]) -> Dict[str, Any]:
         """Execute batch/transaction operations"""
         try:
-            response = self._client.post("", json=bundle)
+            response = self._client.post("", content=orjson.dumps(bundle))
             response.raise_for_status()
-            return response.json()
+            return _decode(response)
         except Exception as e:
             logger.error("Batch operation failed", error=str(e))
             raise
@@ -258,7 +325,7 @@ class FHIRClient:
         try:
             response = self._client.get("metadata")
             response.raise_for_status()
-            return response.json()
+            return _decode(response)
         except Exception as e:
             logger.error("Failed to get capabilities", error=str(e))
             raise
@@ -279,6 +346,11 @@ class FHIRClient:
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Close HTTP clients from async code"""
+        self._client.close()
         await self._async_client.aclose()
 
 
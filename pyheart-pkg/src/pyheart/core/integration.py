@@ -2,12 +2,84 @@
 Integration Hub and Adapters for healthcare systems
 """
 
-from typing import Any, Dict, List, Optional, Protocol
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Protocol, TypeVar, Union
+)
 from abc import ABC, abstractmethod
+import asyncio
+import functools
+import httpx
+import orjson
 import structlog
+from tenacity import (
+    AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential, wait_random
+)
 
 logger = structlog.get_logger()
 
+_FHIR_JSON_HEADERS = {
+    "Accept": "application/fhir+json",
+    "Content-Type": "application/fhir+json"
+}
+
+T = TypeVar("T")
+
+
+def copy_resource(resource: Any) -> Any:
+    """
+    Deep-copy a JSON-like FHIR resource
+    
+    Recurses into dicts and lists only, which is all resources are made of,
+    so it is much cheaper than copy.deepcopy.
+    """
+    if isinstance(resource, dict):
+        return {key: copy_resource(value) for key, value in resource.items()}
+    if isinstance(resource, list):
+        return [copy_resource(value) for value in resource]
+    return resource
+
+
+def fill_template(template: Dict[str, Any], **fields: Any) -> Dict[str, Any]:
+    """
+    Build a resource from a template with the given fields set
+    
+    The result shares no nested structure with the template or the field
+    values, so callers may mutate it freely.
+    """
+    return copy_resource(dict(template, **fields))
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Whether an HTTP failure is worth retrying (network errors, 429 and 5xx)"""
+    if isinstance(exc, httpx.TransportError):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return False
+
+
+def retry_transient_http(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """
+    Retry an async HTTP call on transient failures
+    
+    Up to 5 attempts with jittered exponential backoff (0.1s doubling to 2s),
+    so concurrent callers hitting the same rate limit don't retry in lockstep.
+    Client errors (other 4xx) are raised immediately.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(5),
+            wait=wait_exponential(multiplier=0.1, max=2) + wait_random(0, 0.1),
+            retry=retry_if_exception(_is_transient),
+            reraise=True
+        ):
+            with attempt:
+                return await func(*args, **kwargs)
+    
+    return wrapper
+
 
 class Adapter(Protocol):
     """Protocol for healthcare system adapters"""
@@ -36,10 +108,114 @@ class Adapter(Protocol):
 class BaseAdapter(ABC):
     """Base adapter implementation"""
     
+    # Fixed attribute layout so slotted adapters carry no per-instance __dict__
+    __slots__ = ("system_id", "connected", "config", "_client", "_semaphore")
+    
     def __init__(self, system_id: str):
         self.system_id = system_id
         self.connected = False
         self.config: Dict[str, Any] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+    
+    @property
+    def http_client(self) -> Optional[httpx.AsyncClient]:
+        """Pooled HTTP client shared by all requests of this adapter, once opened"""
+        return self._client
+    
+    def _open_client(self, base_url: str) -> httpx.AsyncClient:
+        """
+        Create the adapter's long-lived HTTP client
+        
+        One pooled client is reused for every call so connections (and their
+        TLS handshakes) are kept alive instead of being rebuilt per request.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=base_url,
+                limits=httpx.Limits(
+                    max_keepalive_connections=self.config.get("max_keepalive_connections", 20),
+                    max_connections=self.config.get("max_connections", 100)
+                ),
+                timeout=self.config.get("timeout", 30),
+                headers=_FHIR_JSON_HEADERS
+            )
+        return self._client
+    
+    async def _close_client(self) -> None:
+        """Close the pooled HTTP client, if one was opened"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    @retry_transient_http
+    async def _request_json(self, method: str, path: str,
+                            body: Optional[Any] = None,
+                            params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Make a FHIR JSON request on the pooled client
+        
+        Bodies are encoded and responses parsed with orjson rather than the
+        stdlib json module, which dominates CPU time on large resources.
+        Transient failures are retried (see retry_transient_http); bulk
+        calls hold their concurrency slot across retries, so retrying never
+        exceeds max_concurrency.
+        
+        Args:
+            method: HTTP method
+            path: Path relative to the adapter's base URL
+            body: JSON-serializable request body
+            params: Query parameters
+            
+        Returns:
+            Parsed response body, or None for an empty response
+            
+        Raises:
+            RuntimeError: If the client has not been opened
+            httpx.HTTPStatusError: On an error status
+        """
+        if self._client is None:
+            raise RuntimeError(f"HTTP client for {self.system_id} is not open")
+        
+        content = orjson.dumps(body) if body is not None else None
+        response = await self._client.request(method, path, content=content, params=params)
+        response.raise_for_status()
+        return orjson.loads(response.content) if response.content else None
+    
+    async def _stream_ndjson(
+        self, path: str, params: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream resources from an NDJSON endpoint (e.g. a FHIR bulk data export)
+        
+        Resources are parsed and yielded line by line, so memory use is bounded
+        by one resource rather than the whole export. Not retried: a stream
+        cannot be resumed part way through.
+        
+        Raises:
+            RuntimeError: If the client has not been opened
+            httpx.HTTPStatusError: On an error status
+        """
+        if self._client is None:
+            raise RuntimeError(f"HTTP client for {self.system_id} is not open")
+        
+        headers = {"Accept": "application/fhir+ndjson"}
+        async with self._client.stream("GET", path, params=params, headers=headers) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line:
+                    yield orjson.loads(line)
+    
+    async def stream_data(self, resource_type: str,
+                          params: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over fetched resources one at a time
+        
+        Adapters backed by a bulk or NDJSON endpoint should override this to
+        stream from _stream_ndjson(); the default iterates over fetch_data().
+        """
+        for resource in await self.fetch_data(resource_type, params):
+            yield resource
     
     async def connect(self, config: Dict[str, Any]) -> bool:
         """Connect to the healthcare system"""
@@ -50,9 +226,66 @@ class BaseAdapter(ABC):
     
     async def disconnect(self) -> bool:
         """Disconnect from the healthcare system"""
+        await self._close_client()
         self.connected = False
         logger.info("Disconnected from system", system_id=self.system_id)
         return True
+    
+    async def fetch_data_bulk(self, resource_type: str,
+                              params_list: List[Dict[str, Any]]
+                              ) -> List[Union[List[Dict[str, Any]], BaseException]]:
+        """
+        Fetch data for several queries at once
+        
+        Adapters whose system supports batched queries should override this;
+        the default runs the individual fetches concurrently, at most
+        ``max_concurrency`` (config, default 20) at a time.
+        
+        Returns:
+            One result list per entry in params_list, in the same order; a
+            query that failed is represented by the exception it raised
+        """
+        semaphore = self._concurrency_limit()
+        
+        async def fetch_one(params: Dict[str, Any]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.fetch_data(resource_type, params)
+        
+        return list(await asyncio.gather(*(fetch_one(params) for params in params_list),
+                                         return_exceptions=True))
+    
+    async def send_data_bulk(self, resource_type: str,
+                             records: List[Dict[str, Any]]) -> List[bool]:
+        """
+        Send several records at once
+        
+        Adapters whose system accepts batch submissions should override this;
+        the default runs the individual sends concurrently, at most
+        ``max_concurrency`` (config, default 20) at a time.
+        
+        Returns:
+            One success flag per record, in the same order
+        """
+        semaphore = self._concurrency_limit()
+        
+        async def send_one(data: Dict[str, Any]) -> bool:
+            async with semaphore:
+                try:
+                    return await self.send_data(resource_type, data)
+                except Exception as e:
+                    logger.error("Error sending record",
+                                system_id=self.system_id,
+                                resource_type=resource_type,
+                                error=str(e))
+                    return False
+        
+        return list(await asyncio.gather(*(send_one(data) for data in records)))
+    
+    def _concurrency_limit(self) -> asyncio.Semaphore:
+        """Semaphore capping concurrent requests; created inside the running loop"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.config.get("max_concurrency", 20))
+        return self._semaphore
 
 
 class FHIRAdapter(BaseAdapter):
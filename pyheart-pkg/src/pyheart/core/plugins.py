@@ -6,17 +6,34 @@ providers, insurance companies, and government offices to easily extend
 PyHeart with custom adapters, workflows, and automations.
 """
 
-from typing import Any, Dict, List, Optional, Type, Callable
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Set, Tuple, Type, Callable
 from abc import ABC, abstractmethod
+from collections import defaultdict
 from dataclasses import dataclass, field
 from enum import Enum
+from types import MappingProxyType
+import asyncio
+import bisect
+import functools
 import importlib
+import itertools
+import os
 import pkgutil
 import inspect
+import sys
 import structlog
+from pyheart.core._compat import DATACLASS_SLOTS
 
 logger = structlog.get_logger()
 
+# Plugin classes found per package, with the package directory mtimes they were scanned at
+_DISCOVERY_CACHE: Dict[
+    str, Tuple[Tuple[Tuple[str, float], ...], List[Tuple[str, Type["Plugin"]]]]
+] = {}
+
+# Path-entry finders per package directory, reused across discovery walks
+_IMPORTER_CACHE: Dict[str, Any] = {}
+
 
 class PluginType(Enum):
     """Types of plugins supported"""
@@ -28,9 +45,9 @@ class PluginType(Enum):
     NOTIFIER = "notifier"  # Notification plugins
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class PluginMetadata:
-    """Metadata for a plugin"""
+    """Metadata for a plugin (immutable once built)"""
     name: str
     version: str
     plugin_type: PluginType
@@ -42,20 +59,71 @@ class PluginMetadata:
     priority: int = 100  # Lower number = higher priority
 
 
+def _memoize_metadata(get_metadata: Callable[["Plugin"], PluginMetadata]
+                      ) -> Callable[["Plugin"], PluginMetadata]:
+    """Wrap a get_metadata implementation so it is built once per plugin instance"""
+    @functools.wraps(get_metadata)
+    def wrapper(self: "Plugin") -> PluginMetadata:
+        cache = getattr(self, "__dict__", None)
+        if cache is None:
+            # Slotted plugin without a _cached_metadata slot; nothing to cache in
+            return get_metadata(self)
+        metadata = cache.get("_cached_metadata")
+        if metadata is None:
+            metadata = cache["_cached_metadata"] = get_metadata(self)
+        return metadata
+    
+    wrapper._memoized = True  # type: ignore[attr-defined]
+    return wrapper
+
+
 class Plugin(ABC):
     """
     Base class for all PyHeart plugins
     
     All plugins must inherit from this class and implement the required methods.
+    Plugins whose metadata does not depend on config can set it once as a
+    class-level _METADATA and return that from get_metadata().
+    
+    Plugin declares no instance layout of its own (empty __slots__), so
+    subclasses may use __slots__ and mix in other slotted bases; subclasses
+    that don't keep an ordinary __dict__.
     """
     
+    __slots__ = ()
+    
+    _METADATA: Optional[PluginMetadata] = None
+    
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        # Metadata is static per instance, so memoize subclass implementations
+        # unless the class already shares a single _METADATA
+        get_metadata = cls.__dict__.get("get_metadata")
+        if (get_metadata is not None and "_METADATA" not in cls.__dict__
+                and not getattr(get_metadata, "_memoized", False)):
+            cls.get_metadata = _memoize_metadata(get_metadata)  # type: ignore[assignment]
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or {}
         self.initialized = False
     
+    @classmethod
+    def metadata_hint(cls) -> Optional[Tuple[bool, PluginType, int]]:
+        """
+        Return a lightweight (enabled, plugin_type, priority) hint, if known
+        
+        Override to let discovery skip disabled plugins without instantiating
+        them or building their full metadata. None means "unknown". Plugins
+        with a class-level _METADATA get their hint from it.
+        """
+        metadata = cls._METADATA
+        if metadata is None:
+            return None
+        return (metadata.enabled, metadata.plugin_type, metadata.priority)
+    
     @abstractmethod
     def get_metadata(self) -> PluginMetadata:
-        """Return plugin metadata"""
+        """Return plugin metadata (built once per instance and cached)"""
         pass
     
     @abstractmethod
@@ -84,7 +152,15 @@ class PluginRegistry:
     def __init__(self):
         self.plugins: Dict[str, Plugin] = {}
         self.metadata: Dict[str, PluginMetadata] = {}
-        self.plugin_hooks: Dict[str, List[Callable]] = {}
+        # Hook callbacks in registration order, each tagged at registration with
+        # whether it is a coroutine function so triggering needs no reflection
+        self._hooks: Dict[str, List[Tuple[Callable, bool]]] = {}
+        # Per-type (priority, registration order, plugin_id) entries, kept sorted
+        self._by_type: Dict[PluginType, List[Tuple[int, int, str]]] = defaultdict(list)
+        self._by_type_cache: Dict[PluginType, Tuple[Plugin, ...]] = {}
+        self._registration_order = itertools.count()
+        # Strong references to cleanup tasks scheduled by unregister_plugin
+        self._pending_cleanups: Set[asyncio.Task] = set()
     
     def register_plugin(self, plugin_id: str, plugin: Plugin) -> bool:
         """
@@ -110,6 +186,9 @@ class PluginRegistry:
             
             self.plugins[plugin_id] = plugin
             self.metadata[plugin_id] = metadata
+            bisect.insort(self._by_type[metadata.plugin_type],
+                          (metadata.priority, next(self._registration_order), plugin_id))
+            self._by_type_cache.pop(metadata.plugin_type, None)
             
             logger.info("Plugin registered successfully",
                        plugin_id=plugin_id,
@@ -125,85 +204,128 @@ class PluginRegistry:
     
     def unregister_plugin(self, plugin_id: str) -> bool:
         """Unregister a plugin"""
-        if plugin_id not in self.plugins:
+        # Remove first so concurrent unregister calls cannot both clean up the plugin
+        plugin = self.plugins.pop(plugin_id, None)
+        if plugin is None:
             return False
         
-        plugin = self.plugins[plugin_id]
+        metadata = self.metadata.pop(plugin_id)
+        self._by_type[metadata.plugin_type] = [
+            entry for entry in self._by_type[metadata.plugin_type] if entry[2] != plugin_id
+        ]
+        self._by_type_cache.pop(metadata.plugin_type, None)
         
         try:
-            # Cleanup plugin
-            import asyncio
-            asyncio.create_task(plugin.cleanup())
+            # Cleanup plugin: schedule on the running loop, or run it now if there is none
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                asyncio.run(plugin.cleanup())
+            else:
+                task = loop.create_task(plugin.cleanup())
+                self._pending_cleanups.add(task)
+                task.add_done_callback(self._pending_cleanups.discard)
         except Exception as e:
             logger.error("Error during plugin cleanup",
                         plugin_id=plugin_id,
                         error=str(e))
         
-        del self.plugins[plugin_id]
-        del self.metadata[plugin_id]
-        
         logger.info("Plugin unregistered", plugin_id=plugin_id)
         return True
     
+    def clear(self) -> None:
+        """
+        Drop all plugins and hooks in one pass, without running plugin cleanup
+        
+        Call cleanup_all() first if the plugins hold resources. Views returned
+        by list_plugins() stay valid and become empty.
+        """
+        self.plugins.clear()
+        self.metadata.clear()
+        self._hooks.clear()
+        self._by_type.clear()
+        self._by_type_cache.clear()
+    
     def get_plugin(self, plugin_id: str) -> Optional[Plugin]:
         """Get a registered plugin by ID"""
         return self.plugins.get(plugin_id)
     
     def get_plugins_by_type(self, plugin_type: PluginType) -> List[Plugin]:
-        """Get all plugins of a specific type"""
-        result = []
-        for plugin_id, metadata in self.metadata.items():
-            if metadata.plugin_type == plugin_type:
-                plugin = self.plugins.get(plugin_id)
-                if plugin:
-                    result.append(plugin)
-        
-        # Sort by priority (lower number = higher priority)
-        result.sort(key=lambda p: p.get_metadata().priority)
-        return result
+        """Get all plugins of a specific type, highest priority first"""
+        plugins = self._by_type_cache.get(plugin_type)
+        if plugins is None:
+            # Entries are kept sorted by priority (lower number = higher priority)
+            plugins = tuple(self.plugins[plugin_id]
+                            for _, _, plugin_id in self._by_type.get(plugin_type, ()))
+            self._by_type_cache[plugin_type] = plugins
+        return list(plugins)
+    
+    def get_plugin_ids_by_type(self, plugin_type: PluginType) -> List[str]:
+        """Get the IDs of all plugins of a specific type, highest priority first"""
+        return [plugin_id for _, _, plugin_id in self._by_type.get(plugin_type, ())]
     
-    def list_plugins(self) -> Dict[str, PluginMetadata]:
-        """List all registered plugins"""
-        return self.metadata.copy()
+    def iter_plugins_by_type(self, plugin_type: PluginType) -> Iterator[Tuple[str, Plugin]]:
+        """Iterate (plugin_id, plugin) pairs of a specific type without building a list"""
+        plugins = self.plugins
+        for _, _, plugin_id in self._by_type.get(plugin_type, ()):
+            yield plugin_id, plugins[plugin_id]
+    
+    def list_plugins(self) -> Mapping[str, PluginMetadata]:
+        """List all registered plugins as a read-only live view"""
+        return MappingProxyType(self.metadata)
     
     async def initialize_all(self) -> Dict[str, bool]:
-        """Initialize all registered plugins"""
-        results = {}
-        
-        for plugin_id, plugin in self.plugins.items():
-            try:
-                success = await plugin.initialize()
-                results[plugin_id] = success
+        """Initialize all registered plugins concurrently"""
+        # Snapshot so plugins (or hooks) registering others mid-startup are safe
+        items = tuple(self.plugins.items())
+        outcomes = await asyncio.gather(
+            *(self._initialize_one(plugin_id, plugin) for plugin_id, plugin in items)
+        )
+        return dict(outcomes)
+    
+    async def _initialize_one(self, plugin_id: str, plugin: Plugin) -> Tuple[str, bool]:
+        """Initialize a single plugin, isolating its failures from the others"""
+        try:
+            success = await plugin.initialize()
+            
+            if success:
+                plugin.initialized = True
+                logger.info("Plugin initialized", plugin_id=plugin_id)
+            else:
+                logger.warning("Plugin initialization failed", plugin_id=plugin_id)
+            
+            return plugin_id, success
                 
-                if success:
-                    plugin.initialized = True
-                    logger.info("Plugin initialized", plugin_id=plugin_id)
-                else:
-                    logger.warning("Plugin initialization failed", plugin_id=plugin_id)
-                    
-            except Exception as e:
-                logger.error("Error initializing plugin",
-                           plugin_id=plugin_id,
-                           error=str(e))
-                results[plugin_id] = False
-        
-        return results
+        except Exception as e:
+            logger.error("Error initializing plugin",
+                       plugin_id=plugin_id,
+                       error=str(e))
+            return plugin_id, False
     
     async def cleanup_all(self) -> None:
-        """Cleanup all registered plugins"""
-        for plugin_id, plugin in self.plugins.items():
-            try:
-                await plugin.cleanup()
-                logger.info("Plugin cleaned up", plugin_id=plugin_id)
-            except Exception as e:
-                logger.error("Error cleaning up plugin",
-                           plugin_id=plugin_id,
-                           error=str(e))
+        """Cleanup all registered plugins concurrently"""
+        items = tuple(self.plugins.items())
+        await asyncio.gather(
+            *(self._cleanup_one(plugin_id, plugin) for plugin_id, plugin in items)
+        )
+    
+    async def _cleanup_one(self, plugin_id: str, plugin: Plugin) -> None:
+        """Cleanup a single plugin, isolating its failures from the others"""
+        try:
+            await plugin.cleanup()
+            logger.info("Plugin cleaned up", plugin_id=plugin_id)
+        except Exception as e:
+            logger.error("Error cleaning up plugin",
+                       plugin_id=plugin_id,
+                       error=str(e))
     
     def discover_plugins(self, package_name: str) -> int:
         """
         Discover and auto-register plugins from a package
         
+        Discovered plugin classes are cached per package and reused until a
+        package directory changes, so repeated discovery skips the module scan.
+        
         Args:
             package_name: Python package to search for plugins
             
@@ -214,28 +336,26 @@ class PluginRegistry:
         
         try:
             package = importlib.import_module(package_name)
+            signature = _package_signature(package)
             
-            for _, module_name, _ in pkgutil.walk_packages(package.__path__,
-                                                          prefix=f"{package_name}."):
+            cached = _DISCOVERY_CACHE.get(package_name)
+            if cached is not None and cached[0] == signature:
+                plugin_classes = cached[1]
+            else:
+                plugin_classes = self._scan_plugin_classes(package_name, package)
+                _DISCOVERY_CACHE[package_name] = (signature, plugin_classes)
+            
+            for plugin_id, plugin_class in plugin_classes:
                 try:
-                    module = importlib.import_module(module_name)
+                    if not self._should_instantiate(plugin_id, plugin_class):
+                        continue
                     
-                    # Find all Plugin subclasses in the module
-                    for name, obj in inspect.getmembers(module):
-                        if (inspect.isclass(obj) and 
-                            issubclass(obj, Plugin) and 
-                            obj is not Plugin):
-                            
-                            # Auto-instantiate and register
-                            plugin_id = f"{package_name}.{name}"
-                            plugin_instance = obj()
-                            
-                            if self.register_plugin(plugin_id, plugin_instance):
-                                count += 1
-                                
+                    # Auto-instantiate and register
+                    if self.register_plugin(plugin_id, plugin_class()):
+                        count += 1
                 except Exception as e:
-                    logger.debug("Error loading module",
-                               module=module_name,
+                    logger.debug("Error instantiating plugin",
+                               plugin_id=plugin_id,
                                error=str(e))
             
             logger.info("Plugin discovery complete",
@@ -249,41 +369,96 @@ class PluginRegistry:
         
         return count
     
+    def _should_instantiate(self, plugin_id: str, plugin_class: Type[Plugin]) -> bool:
+        """Check whether a plugin class is worth instantiating before paying for it"""
+        if plugin_id in self.plugins:
+            logger.warning("Plugin already registered", plugin_id=plugin_id)
+            return False
+        
+        hint = plugin_class.metadata_hint()
+        if hint is not None and not hint[0]:
+            logger.info("Plugin is disabled", plugin_id=plugin_id)
+            return False
+        
+        return True
+    
+    def _scan_plugin_classes(self, package_name: str,
+                             package: Any) -> List[Tuple[str, Type[Plugin]]]:
+        """Import every module of a package and collect the Plugin subclasses it defines"""
+        plugin_classes = []
+        
+        for module in _walk_package(package_name, package.__path__):
+            try:
+                # Find all Plugin subclasses defined in the module (not re-exported);
+                # only top-level names matter, so skip getmembers' dir() walk and sort
+                for name, obj in list(module.__dict__.items()):
+                    if (isinstance(obj, type) and 
+                        issubclass(obj, Plugin) and 
+                        obj is not Plugin and
+                        obj.__module__ == module.__name__):
+                        plugin_classes.append((f"{package_name}.{name}", obj))
+                        
+            except Exception as e:
+                logger.debug("Error inspecting module",
+                           module=module.__name__,
+                           error=str(e))
+        
+        return plugin_classes
+    
     def register_hook(self, hook_name: str, callback: Callable) -> None:
         """
         Register a hook callback
         
         Hooks allow plugins to react to events in the system
         """
-        if hook_name not in self.plugin_hooks:
-            self.plugin_hooks[hook_name] = []
-        
-        self.plugin_hooks[hook_name].append(callback)
+        is_async = inspect.iscoroutinefunction(callback)
+        self._hooks.setdefault(hook_name, []).append((callback, is_async))
         logger.debug("Hook registered", hook=hook_name)
     
     async def trigger_hook(self, hook_name: str, *args, **kwargs) -> List[Any]:
         """
         Trigger all callbacks registered for a hook
         
+        Callbacks run in registration order. Consecutive async callbacks run
+        concurrently, and a synchronous callback registered after them runs
+        once they have all finished.
+        
         Returns:
-            List of results from all callbacks
+            List of results from all callbacks, in registration order
         """
-        if hook_name not in self.plugin_hooks:
-            return []
-        
         results = []
-        for callback in self.plugin_hooks[hook_name]:
-            try:
-                if inspect.iscoroutinefunction(callback):
-                    result = await callback(*args, **kwargs)
+        pending: List[Callable] = []
+        
+        async def run_pending() -> None:
+            outcomes = await asyncio.gather(*(callback(*args, **kwargs) for callback in pending),
+                                            return_exceptions=True)
+            pending.clear()
+            for outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    logger.error("Error executing hook callback",
+                               hook=hook_name,
+                               error=str(outcome))
                 else:
-                    result = callback(*args, **kwargs)
-                results.append(result)
+                    results.append(outcome)
+        
+        # Snapshot the callback list so callbacks may register further hooks
+        for callback, is_async in tuple(self._hooks.get(hook_name, ())):
+            if is_async:
+                pending.append(callback)
+                continue
+            
+            if pending:
+                await run_pending()
+            try:
+                results.append(callback(*args, **kwargs))
             except Exception as e:
                 logger.error("Error executing hook callback",
                            hook=hook_name,
                            error=str(e))
         
+        if pending:
+            await run_pending()
+        
         return results
 
 
@@ -312,6 +487,9 @@ class PluginManager:
             True if loaded successfully
         """
         try:
+            if not self.registry._should_instantiate(plugin_id, plugin_class):
+                return False
+            
             plugin = plugin_class(config=config)
             return self.registry.register_plugin(plugin_id, plugin)
         except Exception as e:
@@ -389,12 +567,51 @@ class PluginManager:
         Returns:
             List of plugin metadata
         """
-        all_metadata = self.registry.list_plugins()
-        
         if plugin_type is None:
-            return list(all_metadata.values())
+            return list(self.registry.metadata.values())
+        
+        # Use the registry's per-type index instead of filtering every plugin
+        metadata = self.registry.metadata
+        return [metadata[plugin_id]
+                for plugin_id in self.registry.get_plugin_ids_by_type(plugin_type)]
+
+
+def _package_signature(package: Any) -> Tuple[Tuple[str, float], ...]:
+    """Modification times of a package's directories, used to invalidate discovery"""
+    signature = []
+    for path in package.__path__:
+        try:
+            signature.append((path, os.path.getmtime(path)))
+        except OSError:
+            signature.append((path, 0.0))
+    return tuple(signature)
+
+
+def _walk_package(package_name: str, package_path: List[str]):
+    """Import and yield every module under a package, reusing cached path-entry finders"""
+    for path in package_path:
+        finder = _IMPORTER_CACHE.get(path)
+        if finder is None:
+            finder = pkgutil.get_importer(path)
+            if finder is None:
+                continue
+            _IMPORTER_CACHE[path] = finder
         
-        return [m for m in all_metadata.values() if m.plugin_type == plugin_type]
+        for module_name, is_package in pkgutil.iter_importer_modules(finder, f"{package_name}."):
+            module = sys.modules.get(module_name)
+            if module is None:
+                try:
+                    module = importlib.import_module(module_name)
+                except Exception as e:
+                    logger.debug("Error loading module",
+                               module=module_name,
+                               error=str(e))
+                    continue
+            
+            yield module
+            
+            if is_package:
+                yield from _walk_package(module_name, getattr(module, "__path__", []))
 
 
 # Global plugin manager instance
@@ -166,9 +166,11 @@ class EncryptionManager:
         # Fields to encrypt
         pii_fields = ["name", "address", "phone", "email", "ssn"]
         
-        for field in pii_fields:
-            if field in encrypted_data:
-                encrypted_data[field] = self.encrypt_data(str(encrypted_data[field]), field)
+        for field_name in pii_fields:
+            if field_name in encrypted_data:
+                encrypted_data[field_name] = self.encrypt_data(
+                    str(encrypted_data[field_name]), field_name
+                )
         
         return encrypted_data
 
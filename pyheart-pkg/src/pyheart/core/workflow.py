@@ -2,14 +2,18 @@
 Workflow Engine for healthcare process orchestration
 """
 
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable, Tuple
 from datetime import datetime
 from enum import Enum
+from array import array
+from functools import lru_cache
 import asyncio
-from pydantic import BaseModel, Field
+import re
+from pydantic import BaseModel, Field, PrivateAttr
 import structlog
 from dataclasses import dataclass
 import json
+from pyheart.core._compat import DATACLASS_SLOTS
 
 logger = structlog.get_logger()
 
@@ -24,6 +28,61 @@ class TaskStatus(str, Enum):
     SKIPPED = "skipped"
 
 
+# Statuses after which a workflow instance no longer changes
+_TERMINAL_STATUSES = frozenset({TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED})
+
+# Compact integer codes used to pack per-task statuses into a byte array
+_STATUS_CODES: Dict[TaskStatus, int] = {status: code for code, status in enumerate(TaskStatus)}
+
+
+# Comparison operators understood by decision conditions
+_CONDITION_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": lambda left, right: left == right,
+    "gt": lambda left, right: float(left) > float(right),
+    "lt": lambda left, right: float(left) < float(right),
+}
+
+
+# ``${name}`` placeholders in task templates
+_VARIABLE_PATTERN = re.compile(r"\$\{([^}]*)\}")
+
+
+@lru_cache(maxsize=1024)
+def _tokenize_template(template: str) -> Tuple[str, ...]:
+    """
+    Split a template into alternating literal text and variable names
+    
+    Even positions hold literal text and odd positions hold variable names,
+    so rendering is a single pass over the tokens.
+    """
+    return tuple(_VARIABLE_PATTERN.split(template))
+
+
+def _render_template(tokens: Tuple[str, ...], variables: Dict[str, Any]) -> str:
+    """Render pre-tokenized template text against workflow variables"""
+    parts = list(tokens)
+    for i in range(1, len(parts), 2):
+        name = parts[i]
+        parts[i] = str(variables[name]) if name in variables else f"${{{name}}}"
+    return "".join(parts)
+
+
+# Decision-rule action handlers, keyed by action type
+_ACTION_HANDLERS: Dict[str, Callable] = {}
+
+
+def register_action(action_type: str) -> Callable[[Callable], Callable]:
+    """
+    Register a decision-rule action handler
+    
+    Handlers are coroutines called as ``handler(engine, action, instance)``.
+    """
+    def decorator(handler: Callable) -> Callable:
+        _ACTION_HANDLERS[action_type] = handler
+        return handler
+    return decorator
+
+
 class TaskType(str, Enum):
     """Types of workflow tasks"""
     API_CALL = "api_call"
@@ -36,7 +95,7 @@ class TaskType(str, Enum):
     SEQUENCE = "sequence"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class TaskResult:
     """Result of task execution"""
     status: TaskStatus
@@ -69,6 +128,9 @@ class ProcessDefinition(BaseModel):
     variables: Dict[str, Any] = Field(default_factory=dict)
     triggers: List[Dict[str, Any]] = Field(default_factory=list)
     metadata: Dict[str, Any] = Field(default_factory=dict)
+    
+    # Stable ordinal of each top-level task, assigned at registration
+    _task_index: Dict[str, int] = PrivateAttr(default_factory=dict)
 
 
 class WorkflowInstance(BaseModel):
@@ -81,6 +143,21 @@ class WorkflowInstance(BaseModel):
     task_results: Dict[str, TaskResult] = Field(default_factory=dict)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    # Packed status codes of the top-level tasks, indexed by task ordinal
+    _status_array: array = PrivateAttr(default_factory=lambda: array("b"))
+    
+    def is_finished(self) -> bool:
+        """Check whether the instance has reached a terminal status"""
+        return self.status in _TERMINAL_STATUSES
+    
+    def count_tasks(self, status: TaskStatus) -> int:
+        """Count top-level tasks currently in the given status"""
+        return self._status_array.count(_STATUS_CODES[status])
+    
+    def has_failed_tasks(self) -> bool:
+        """Check whether any top-level task has failed"""
+        return _STATUS_CODES[TaskStatus.FAILED] in self._status_array
 
 
 class WorkflowEngine:
@@ -99,6 +176,9 @@ class WorkflowEngine:
         self.processes: Dict[str, ProcessDefinition] = {}
         self.instances: Dict[str, WorkflowInstance] = {}
         self.task_handlers: Dict[TaskType, Callable] = {}
+        # Per-process execution plans and compiled decision rules, built at registration
+        self._execution_plans: Dict[str, List[Task]] = {}
+        self._decision_rules: Dict[Tuple[str, str], Tuple[Task, List[Tuple[Callable, List]]]] = {}
         self._register_default_handlers()
     
     def _register_default_handlers(self):
@@ -112,11 +192,50 @@ class WorkflowEngine:
     
     def register_process(self, process: ProcessDefinition):
         """Register a process definition"""
+        self._validate_actions(process)
+        process._task_index = {task.id: i for i, task in enumerate(process.tasks)}
         self.processes[process.id] = process
+        self._compile_process(process)
         logger.info("Registered process", 
                    process_id=process.id,
                    name=process.name)
     
+    def _validate_actions(self, process: ProcessDefinition):
+        """
+        Fail fast on decision-rule actions that have no registered handler
+        
+        Checks top-level tasks and the sub-tasks nested in parallel and
+        sequence tasks.
+        """
+        pending = [(task.id, task.type, task.config) for task in process.tasks]
+        while pending:
+            task_id, task_type, config = pending.pop()
+            if task_type in (TaskType.PARALLEL, TaskType.SEQUENCE):
+                pending.extend(
+                    (subtask.get("id"), subtask.get("type"), subtask.get("config") or {})
+                    for subtask in config.get("tasks", [])
+                )
+            elif task_type == TaskType.DECISION:
+                for rule in config.get("rules", []):
+                    for action in rule.get("actions", []):
+                        action_type = action.get("type", "")
+                        if action_type not in _ACTION_HANDLERS:
+                            raise ValueError(
+                                f"Unknown action type '{action_type}' in task {task_id}"
+                            )
+    
+    def _compile_process(self, process: ProcessDefinition):
+        """Resolve execution order and decision rules once per process"""
+        self._execution_plans[process.id] = self._get_execution_order(process.tasks)
+        
+        for key in [key for key in self._decision_rules if key[0] == process.id]:
+            del self._decision_rules[key]
+        for task in process.tasks:
+            if task.type == TaskType.DECISION:
+                self._decision_rules[(process.id, task.id)] = (
+                    task, self._compile_rules(task.config.get("rules", []))
+                )
+    
     async def start_process(self, 
                           process_id: str,
                           variables: Optional[Dict[str, Any]] = None) -> str:
@@ -141,6 +260,9 @@ class WorkflowEngine:
             process_id=process_id,
             variables={**process.variables, **(variables or {})}
         )
+        instance._status_array = array(
+            "b", [_STATUS_CODES[TaskStatus.PENDING]] * len(process.tasks)
+        )
         
         self.instances[instance.id] = instance
         
@@ -162,14 +284,23 @@ class WorkflowEngine:
         
         try:
             # Execute tasks in dependency order
-            for task in self._get_execution_order(process.tasks):
-                if instance.status == TaskStatus.CANCELLED:
+            plan = self._execution_plans.get(process.id)
+            if plan is None:
+                plan = self._get_execution_order(process.tasks)
+            
+            for task in plan:
+                if instance.status is TaskStatus.CANCELLED:
                     break
                 
                 await self._execute_task(instance, task)
+                
+                # Stop at the first failed task; later tasks stay pending
+                if instance.has_failed_tasks():
+                    break
             
-            if instance.status != TaskStatus.CANCELLED:
-                instance.status = TaskStatus.COMPLETED
+            if instance.status is not TaskStatus.CANCELLED:
+                instance.status = (TaskStatus.FAILED if instance.has_failed_tasks()
+                                   else TaskStatus.COMPLETED)
         except Exception as e:
             logger.error("Workflow execution failed",
                        instance_id=instance_id,
@@ -190,12 +321,13 @@ class WorkflowEngine:
         # Check dependencies
         for dep_id in task.dependencies:
             dep_result = instance.task_results.get(dep_id)
-            if not dep_result or dep_result.status != TaskStatus.COMPLETED:
+            if not dep_result or dep_result.status is not TaskStatus.COMPLETED:
                 logger.warning("Skipping task due to failed dependency",
                              task_id=task.id,
                              dependency=dep_id)
                 result = TaskResult(status=TaskStatus.SKIPPED)
                 instance.task_results[task.id] = result
+                self._record_status(instance, task.id, TaskStatus.SKIPPED)
                 return result
         
         # Execute task
@@ -204,6 +336,7 @@ class WorkflowEngine:
             started_at=datetime.utcnow()
         )
         instance.task_results[task.id] = result
+        self._record_status(instance, task.id, TaskStatus.RUNNING)
         
         try:
             handler = self.task_handlers.get(task.type)
@@ -223,8 +356,18 @@ class WorkflowEngine:
             result.error = str(e)
             result.completed_at = datetime.utcnow()
         
+        self._record_status(instance, task.id, result.status)
         return result
     
+    def _record_status(self,
+                       instance: WorkflowInstance,
+                       task_id: str,
+                       status: TaskStatus):
+        """Mirror a top-level task status into the instance's packed status array"""
+        index = self.processes[instance.process_id]._task_index.get(task_id)
+        if index is not None and index < len(instance._status_array):
+            instance._status_array[index] = _STATUS_CODES[status]
+    
     def _get_execution_order(self, tasks: List[Task]) -> List[Task]:
         """Get tasks in execution order based on dependencies"""
         # Simple topological sort
@@ -288,14 +431,15 @@ class WorkflowEngine:
                              task: Task,
                              instance: WorkflowInstance) -> Any:
         """Handle decision task"""
-        config = task.config
-        rules = config.get("rules", [])
-        
-        for rule in rules:
-            condition = rule.get("condition", {})
-            if self._evaluate_condition(condition, instance.variables):
+        cached = self._decision_rules.get((instance.process_id, task.id))
+        if cached is not None and cached[0] is task:
+            rules = cached[1]
+        else:
+            rules = self._compile_rules(task.config.get("rules", []))
+        
+        for predicate, actions in rules:
+            if predicate(instance.variables):
                 # Execute actions
-                actions = rule.get("actions", [])
                 for action in actions:
                     await self._execute_action(action, instance)
                 return True
@@ -345,7 +489,7 @@ class WorkflowEngine:
             result = await self._execute_task(instance, subtask)
             results.append(result)
             
-            if result.status == TaskStatus.FAILED:
+            if result.status is TaskStatus.FAILED:
                 break
         
         return results
@@ -355,10 +499,9 @@ class WorkflowEngine:
                             variables: Dict[str, Any]) -> Any:
         """Substitute variables in template"""
         if isinstance(template, str):
-            # Simple variable substitution
-            for key, value in variables.items():
-                template = template.replace(f"${{{key}}}", str(value))
-            return template
+            if "${" not in template:
+                return template
+            return _render_template(_tokenize_template(template), variables)
         elif isinstance(template, dict):
             return {
                 k: self._substitute_variables(v, variables)
@@ -375,43 +518,74 @@ class WorkflowEngine:
                           condition: Dict[str, Any],
                           variables: Dict[str, Any]) -> bool:
         """Evaluate condition"""
-        operator = condition.get("operator", "eq")
-        left = condition.get("left", "")
-        right = condition.get("right", "")
-        
-        left_value = self._get_variable_value(left, variables)
-        right_value = self._get_variable_value(right, variables)
-        
-        if operator == "eq":
-            return left_value == right_value
-        elif operator == "gt":
-            return float(left_value) > float(right_value)
-        elif operator == "lt":
-            return float(left_value) < float(right_value)
-        
-        return False
+        return self._compile_condition(condition)(variables)
     
-    def _get_variable_value(self, 
-                          expr: str,
-                          variables: Dict[str, Any]) -> Any:
-        """Get variable value from expression"""
-        if expr.startswith("$"):
+    def _compile_rules(self,
+                       rules: List[Dict[str, Any]]) -> List[Tuple[Callable, List]]:
+        """Compile decision rules into (predicate, actions) pairs"""
+        return [
+            (self._compile_condition(rule.get("condition", {})), rule.get("actions", []))
+            for rule in rules
+        ]
+    
+    def _compile_condition(self,
+                           condition: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+        """Compile a condition into a predicate over workflow variables"""
+        compare = _CONDITION_OPERATORS.get(condition.get("operator", "eq"))
+        if compare is None:
+            return lambda variables: False
+        
+        left = self._compile_operand(condition.get("left", ""))
+        right = self._compile_operand(condition.get("right", ""))
+        return lambda variables: compare(left(variables), right(variables))
+    
+    def _compile_operand(self, expr: Any) -> Callable[[Dict[str, Any]], Any]:
+        """Compile an operand into a lookup against workflow variables"""
+        if isinstance(expr, str) and expr.startswith("$"):
             var_name = expr[1:]
-            return variables.get(var_name)
-        return expr
+            return lambda variables: variables.get(var_name)
+        return lambda variables: expr
     
     async def _execute_action(self,
                             action: Dict[str, Any],
                             instance: WorkflowInstance):
         """Execute action"""
         action_type = action.get("type", "")
+        handler = _ACTION_HANDLERS.get(action_type)
         
-        if action_type == "set_variable":
-            var_name = action.get("variable", "")
-            value = action.get("value", "")
-            instance.variables[var_name] = value
-        elif action_type == "notification":
-            logger.info("Action: notification", recipient=action.get("recipient"))
+        if handler is None:
+            logger.warning("Unknown action type", action_type=action_type)
+            return
+        
+        await handler(self, action, instance)
+    
+    @register_action("set_variable")
+    async def _set_variable_action(self,
+                                   action: Dict[str, Any],
+                                   instance: WorkflowInstance):
+        """Set a workflow variable"""
+        var_name = action.get("variable", "")
+        value = action.get("value", "")
+        instance.variables[var_name] = value
+    
+    @register_action("call_api")
+    async def _call_api_action(self,
+                               action: Dict[str, Any],
+                               instance: WorkflowInstance):
+        """Call an API endpoint"""
+        endpoint = self._substitute_variables(action.get("endpoint", ""), instance.variables)
+        
+        # In production, would use actual HTTP client
+        logger.info("Action: call_api",
+                   method=action.get("method", "POST"),
+                   endpoint=endpoint)
+    
+    @register_action("notification")
+    async def _notification_action(self,
+                                   action: Dict[str, Any],
+                                   instance: WorkflowInstance):
+        """Send a notification"""
+        logger.info("Action: notification", recipient=action.get("recipient"))
     
     def get_instance_status(self, instance_id: str) -> Optional[WorkflowInstance]:
         """Get workflow instance status"""
@@ -420,8 +594,20 @@ class WorkflowEngine:
     def cancel_instance(self, instance_id: str) -> bool:
         """Cancel workflow instance"""
         instance = self.instances.get(instance_id)
-        if instance and instance.status == TaskStatus.RUNNING:
+        if instance and instance.status is TaskStatus.RUNNING:
             instance.status = TaskStatus.CANCELLED
             logger.info("Cancelled workflow instance", instance_id=instance_id)
             return True
-        return False
\ No newline at end of file
+        return False
+
+
+# Global workflow engine instance
+_workflow_engine: Optional[WorkflowEngine] = None
+
+
+def get_workflow_engine() -> WorkflowEngine:
+    """Get the global workflow engine instance"""
+    global _workflow_engine
+    if _workflow_engine is None:
+        _workflow_engine = WorkflowEngine()
+    return _workflow_engine
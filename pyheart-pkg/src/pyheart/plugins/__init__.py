@@ -8,12 +8,20 @@ Pre-built plugins for common healthcare use cases:
 - Automation workflows
 """
 
-from pyheart.plugins.insurance import InsuranceAdapter
-from pyheart.plugins.government import GovernmentAdapter
-from pyheart.plugins.provider import ProviderAdapter
+from pyheart.core._lazy import lazy_exports
+
+# Adapters are imported on first access (PEP 562) so that using one plugin
+# does not pay the import cost of all of them
+_LAZY_EXPORTS = {
+    "InsuranceAdapter": "pyheart.plugins.insurance",
+    "GovernmentAdapter": "pyheart.plugins.government",
+    "ProviderAdapter": "pyheart.plugins.provider",
+}
 
 __all__ = [
     "InsuranceAdapter",
     "GovernmentAdapter", 
     "ProviderAdapter",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _LAZY_EXPORTS)
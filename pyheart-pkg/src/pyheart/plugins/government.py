@@ -9,13 +9,41 @@ Provides pre-built adapters and workflows for government healthcare offices incl
 - Immunization reporting
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Pattern
 from pyheart.core.plugins import Plugin, PluginMetadata, PluginType
-from pyheart.core.integration import BaseAdapter
+from pyheart.core.integration import BaseAdapter, copy_resource
+import re
 import structlog
 
 logger = structlog.get_logger()
 
+# Fields each submission type must carry
+_PH_REPORT_REQUIRED = frozenset({"patient", "condition", "onsetDate", "reportingProvider"})
+_IMMUNIZATION_REQUIRED = frozenset({"vaccineCode", "patient"})
+_QUALITY_MEASURE_REQUIRED = frozenset({"measure", "period"})
+
+# Vaccine code of simulated registry records; each record gets its own copy
+_COVID19_VACCINE_CODE: Dict[str, Any] = {
+    "coding": [{
+        "system": "http://hl7.org/fhir/sid/cvx",
+        "code": "208",
+        "display": "COVID-19 vaccine"
+    }]
+}
+
+
+def _vaccine_key(vaccine_code: Any) -> Any:
+    """
+    Reduce a vaccineCode to a hashable key
+    
+    Plain strings are used as-is; CodeableConcepts are keyed by their text,
+    falling back to the first coding's display, then its code.
+    """
+    if not isinstance(vaccine_code, dict):
+        return vaccine_code
+    coding = (vaccine_code.get("coding") or [{}])[0]
+    return vaccine_code.get("text") or coding.get("display") or coding.get("code")
+
 
 class GovernmentAdapter(Plugin, BaseAdapter):
     """
@@ -29,32 +57,43 @@ class GovernmentAdapter(Plugin, BaseAdapter):
     - Vital records reporting
     """
     
+    __slots__ = ("initialized", "reporting_endpoint", "registry_endpoint", "agency_type")
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
-        Plugin.__init__(self, config)
+        # BaseAdapter resets config, so it must run before Plugin stores it
         BaseAdapter.__init__(self, config.get("system_id", "government") if config else "government")
+        Plugin.__init__(self, config)
         self.reporting_endpoint = ""
         self.registry_endpoint = ""
         self.agency_type = ""
     
+    _METADATA = PluginMetadata(
+        name="Government Adapter",
+        version="1.0.0",
+        plugin_type=PluginType.ADAPTER,
+        description=(
+            "Government healthcare office integration for public health reporting "
+            "and registry submissions"
+        ),
+        author="BrainSAIT Healthcare Innovation Lab",
+        dependencies=["httpx", "fhir.resources"],
+        config_schema={
+            "system_id": {"type": "string", "required": True},
+            "agency_type": {
+                "type": "string",
+                "required": True,
+                "enum": ["public_health", "medicare", "medicaid", "cdc", "state_registry"],
+            },
+            "base_url": {"type": "string", "required": True},
+            "api_key": {"type": "string", "required": False},
+            "jurisdiction": {"type": "string", "required": True},
+            "reporting_format": {"type": "string", "default": "fhir"}
+        }
+    )
+    
     def get_metadata(self) -> PluginMetadata:
         """Return plugin metadata"""
-        return PluginMetadata(
-            name="Government Adapter",
-            version="1.0.0",
-            plugin_type=PluginType.ADAPTER,
-            description="Government healthcare office integration for public health reporting and registry submissions",
-            author="BrainSAIT Healthcare Innovation Lab",
-            dependencies=["httpx", "fhir.resources"],
-            config_schema={
-                "system_id": {"type": "string", "required": True},
-                "agency_type": {"type": "string", "required": True, 
-                               "enum": ["public_health", "medicare", "medicaid", "cdc", "state_registry"]},
-                "base_url": {"type": "string", "required": True},
-                "api_key": {"type": "string", "required": False},
-                "jurisdiction": {"type": "string", "required": True},
-                "reporting_format": {"type": "string", "default": "fhir"}
-            }
-        )
+        return self._METADATA
     
     async def initialize(self) -> bool:
         """Initialize the government adapter"""
@@ -128,6 +167,40 @@ class GovernmentAdapter(Plugin, BaseAdapter):
                           resource_type=resource_type)
             return False
     
+    async def fetch_data_bulk(self, resource_type: str,
+                              params_list: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Fetch data for several queries in one registry request
+        
+        Immunization queries for a patient panel are sent as a single batch;
+        other resource types fall back to per-query fetches.
+        """
+        if resource_type != "Immunization":
+            return await super().fetch_data_bulk(resource_type, params_list)
+        
+        logger.info("Fetching government data in bulk",
+                   system_id=self.system_id,
+                   resource_type=resource_type,
+                   queries=len(params_list))
+        
+        return await self._fetch_immunizations_bulk(params_list)
+    
+    async def send_data_bulk(self, resource_type: str,
+                             records: List[Dict[str, Any]]) -> List[bool]:
+        """
+        Send several records to the government system as one batch Bundle
+        
+        Public health reports and immunizations are submitted in a single
+        request; other resource types fall back to per-record sends.
+        """
+        if resource_type == "PublicHealthCase":
+            return await self._submit_bulk(resource_type, records,
+                                           self._validate_public_health_report)
+        elif resource_type == "Immunization":
+            return await self._submit_immunization_bulk(records)
+        else:
+            return await super().send_data_bulk(resource_type, records)
+    
     async def _fetch_quality_measures(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Fetch quality measure reports"""
         measure_id = params.get("measure_id")
@@ -158,21 +231,31 @@ class GovernmentAdapter(Plugin, BaseAdapter):
         logger.info("Fetching immunizations from registry",
                    patient_id=patient_id)
         
-        return [{
+        return [self._immunization_record(patient_id)]
+    
+    async def _fetch_immunizations_bulk(
+        self, params_list: List[Dict[str, Any]]
+    ) -> List[List[Dict[str, Any]]]:
+        """Fetch immunization records for several patients in one registry query"""
+        patient_ids = [params.get("patient_id") for params in params_list]
+        
+        logger.info("Fetching immunizations from registry in bulk",
+                   endpoint=self.registry_endpoint,
+                   patients=len(patient_ids))
+        
+        return [[self._immunization_record(patient_id)] for patient_id in patient_ids]
+    
+    def _immunization_record(self, patient_id: Optional[str]) -> Dict[str, Any]:
+        """Build an immunization record as returned by the registry"""
+        return {
             "resourceType": "Immunization",
             "id": "imm-001",
             "status": "completed",
-            "vaccineCode": {
-                "coding": [{
-                    "system": "http://hl7.org/fhir/sid/cvx",
-                    "code": "208",
-                    "display": "COVID-19 vaccine"
-                }]
-            },
+            "vaccineCode": copy_resource(_COVID19_VACCINE_CODE),
             "patient": {"reference": f"Patient/{patient_id}"},
             "occurrenceDateTime": "2024-01-15",
             "source": self.system_id
-        }]
+        }
     
     async def _submit_public_health_report(self, data: Dict[str, Any]) -> bool:
         """Submit public health case report"""
@@ -181,12 +264,8 @@ class GovernmentAdapter(Plugin, BaseAdapter):
                    jurisdiction=self.config.get("jurisdiction"),
                    condition=data.get("condition"))
         
-        # Validate required fields for public health reporting
-        required_fields = ["patient", "condition", "onsetDate", "reportingProvider"]
-        for field in required_fields:
-            if field not in data:
-                logger.error(f"Missing required field for public health report: {field}")
-                return False
+        if not self._validate_public_health_report(data):
+            return False
         
         # In production, submit to actual public health system
         logger.info("Public health report submitted successfully")
@@ -198,15 +277,62 @@ class GovernmentAdapter(Plugin, BaseAdapter):
                    vaccine=data.get("vaccineCode"),
                    patient=data.get("patient"))
         
-        # Validate immunization data
-        if not data.get("vaccineCode") or not data.get("patient"):
-            logger.error("Invalid immunization data")
+        if not self._validate_immunization(data):
             return False
         
         # In production, submit to immunization registry
         logger.info("Immunization submitted to registry successfully")
         return True
     
+    async def _submit_immunization_bulk(self, records: List[Dict[str, Any]]) -> List[bool]:
+        """Submit many immunization records to the registry in one batch"""
+        return await self._submit_bulk("Immunization", records, self._validate_immunization)
+    
+    async def _submit_bulk(self, resource_type: str, records: List[Dict[str, Any]],
+                           validate: Callable[[Dict[str, Any]], bool]) -> List[bool]:
+        """
+        Validate records and submit the valid ones as a single FHIR batch Bundle
+        
+        Returns:
+            One success flag per record, in the same order
+        """
+        results = [validate(data) for data in records]
+        bundle = {
+            "resourceType": "Bundle",
+            "type": "batch",
+            "entry": [
+                {"resource": data, "request": {"method": "POST", "url": resource_type}}
+                for data, valid in zip(records, results) if valid
+            ]
+        }
+        
+        logger.info("Submitting batch to government system",
+                   system_id=self.system_id,
+                   endpoint=f"{self.reporting_endpoint}/$submit-list",
+                   resource_type=resource_type,
+                   submitted=len(bundle["entry"]),
+                   rejected=len(records) - len(bundle["entry"]))
+        
+        # In production, POST the bundle to the reporting endpoint
+        return results
+    
+    def _validate_public_health_report(self, data: Dict[str, Any]) -> bool:
+        """Validate required fields for public health reporting"""
+        missing = _PH_REPORT_REQUIRED - data.keys()
+        if missing:
+            logger.error("Missing required fields for public health report",
+                        missing=sorted(missing))
+            return False
+        return True
+    
+    def _validate_immunization(self, data: Dict[str, Any]) -> bool:
+        """Validate immunization data"""
+        missing = _IMMUNIZATION_REQUIRED - data.keys()
+        if missing or not all(map(data.get, _IMMUNIZATION_REQUIRED)):
+            logger.error("Invalid immunization data", missing=sorted(missing))
+            return False
+        return True
+    
     async def _submit_quality_measure(self, data: Dict[str, Any]) -> bool:
         """Submit quality measure report"""
         logger.info("Submitting quality measure report",
@@ -214,8 +340,9 @@ class GovernmentAdapter(Plugin, BaseAdapter):
                    period=data.get("period"))
         
         # Validate quality measure report
-        if not data.get("measure") or not data.get("period"):
-            logger.error("Invalid quality measure report")
+        missing = _QUALITY_MEASURE_REQUIRED - data.keys()
+        if missing or not all(map(data.get, _QUALITY_MEASURE_REQUIRED)):
+            logger.error("Invalid quality measure report", missing=sorted(missing))
             return False
         
         # In production, submit to CMS or state quality reporting system
@@ -245,17 +372,23 @@ class PublicHealthReportingPlugin(Plugin):
             "Influenza",
             "Salmonella"
         ]
+        self._reportable_re = self._compile_reportable_pattern()
+    
+    _METADATA = PluginMetadata(
+        name="Public Health Reporting",
+        version="1.0.0",
+        plugin_type=PluginType.WORKFLOW,
+        description="Automated detection and reporting of public health conditions",
+        author="BrainSAIT Healthcare Innovation Lab"
+    )
     
     def get_metadata(self) -> PluginMetadata:
-        return PluginMetadata(
-            name="Public Health Reporting",
-            version="1.0.0",
-            plugin_type=PluginType.WORKFLOW,
-            description="Automated detection and reporting of public health conditions",
-            author="BrainSAIT Healthcare Innovation Lab"
-        )
+        """Return plugin metadata"""
+        return self._METADATA
     
     async def initialize(self) -> bool:
+        # Rebuild the matcher in case reportable_conditions was changed after construction
+        self._reportable_re = self._compile_reportable_pattern()
         logger.info("Public health reporting plugin initialized",
                    reportable_conditions=len(self.reportable_conditions))
         return True
@@ -264,10 +397,17 @@ class PublicHealthReportingPlugin(Plugin):
         logger.info("Public health reporting plugin cleanup")
         return True
     
+    def _compile_reportable_pattern(self) -> Pattern[str]:
+        """Build a single case-insensitive matcher for all reportable conditions"""
+        if not self.reportable_conditions:
+            return re.compile(r"(?!)")
+        return re.compile("|".join(re.escape(rc) for rc in self.reportable_conditions),
+                          re.IGNORECASE)
+    
     def is_reportable(self, condition: str) -> bool:
         """Check if a condition is reportable"""
         # In production, use more sophisticated matching with ICD codes
-        return any(rc.lower() in condition.lower() for rc in self.reportable_conditions)
+        return self._reportable_re.search(condition) is not None
     
     async def generate_report(self, patient_data: Dict[str, Any], 
                             condition_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -311,14 +451,19 @@ class ImmunizationRegistryPlugin(Plugin):
     - Generate immunization reports
     """
     
+    _STANDARD_VACCINES = ("COVID-19", "Influenza", "Tetanus", "MMR")
+    
+    _METADATA = PluginMetadata(
+        name="Immunization Registry",
+        version="1.0.0",
+        plugin_type=PluginType.WORKFLOW,
+        description="Automated immunization registry integration and forecasting",
+        author="BrainSAIT Healthcare Innovation Lab"
+    )
+    
     def get_metadata(self) -> PluginMetadata:
-        return PluginMetadata(
-            name="Immunization Registry",
-            version="1.0.0",
-            plugin_type=PluginType.WORKFLOW,
-            description="Automated immunization registry integration and forecasting",
-            author="BrainSAIT Healthcare Innovation Lab"
-        )
+        """Return plugin metadata"""
+        return self._METADATA
     
     async def initialize(self) -> bool:
         logger.info("Immunization registry plugin initialized")
@@ -341,20 +486,20 @@ class ImmunizationRegistryPlugin(Plugin):
             List of recommended immunizations with due dates
         """
         # Simplified forecasting logic - in production use CDC schedules
-        recommendations = []
-        
         # Check for common vaccines
-        vaccines_given = [imm.get("vaccineCode") for imm in immunization_history]
+        vaccines_given = frozenset(_vaccine_key(imm.get("vaccineCode"))
+                                   for imm in immunization_history)
         
-        standard_vaccines = ["COVID-19", "Influenza", "Tetanus", "MMR"]
-        for vaccine in standard_vaccines:
-            if vaccine not in vaccines_given:
-                recommendations.append({
-                    "vaccine": vaccine,
-                    "status": "due",
-                    "dueDate": "2024-01-01",
-                    "patient": patient_id
-                })
+        recommendations = [
+            {
+                "vaccine": vaccine,
+                "status": "due",
+                "dueDate": "2024-01-01",
+                "patient": patient_id
+            }
+            for vaccine in self._STANDARD_VACCINES
+            if vaccine not in vaccines_given
+        ]
         
         logger.info("Immunization forecast generated",
                    patient=patient_id,
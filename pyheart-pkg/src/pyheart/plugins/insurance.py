@@ -11,11 +11,69 @@ Provides pre-built adapters and workflows for insurance companies including:
 
 from typing import Any, Dict, List, Optional
 from pyheart.core.plugins import Plugin, PluginMetadata, PluginType
-from pyheart.core.integration import BaseAdapter
+from pyheart.core.integration import BaseAdapter, copy_resource, fill_template
+from pyheart.core.batching import BatchQueue
+from pyheart.core.caching import SingleFlight, TTLCache, params_key
+import asyncio
 import structlog
 
 logger = structlog.get_logger()
 
+# Fields every claim must carry before it is submitted
+_CLAIM_REQUIRED_FIELDS = ("patient", "provider", "diagnosis", "serviceDate")
+_CLAIM_REQUIRED_FIELD_SET = frozenset(_CLAIM_REQUIRED_FIELDS)
+
+# Coded values shared by the resource templates
+_CLAIM_TYPE_INSTITUTIONAL: Dict[str, Any] = {
+    "coding": [{
+        "system": "http://terminology.hl7.org/CodeSystem/claim-type",
+        "code": "institutional"
+    }]
+}
+
+# Resource templates for simulated responses; per-call fields are None and filled
+# with fill_template(), which copies the nested parts so results never share them
+_CLAIM_TEMPLATE: Dict[str, Any] = {
+    "resourceType": "Claim",
+    "id": None,
+    "status": "active",
+    "type": _CLAIM_TYPE_INSTITUTIONAL,
+    "patient": None,
+    "billablePeriod": {
+        "start": "2024-01-01",
+        "end": "2024-01-05"
+    },
+    "insurance": [{
+        "sequence": 1,
+        "focal": True,
+        "coverage": {"reference": "Coverage/sample-coverage"}
+    }],
+    "source": None
+}
+
+_COVERAGE_TEMPLATE: Dict[str, Any] = {
+    "resourceType": "Coverage",
+    "id": "sample-coverage-001",
+    "status": "active",
+    "beneficiary": None,
+    "payor": None,
+    "period": {
+        "start": "2024-01-01",
+        "end": "2024-12-31"
+    },
+    "source": None
+}
+
+_EOB_TEMPLATE: Dict[str, Any] = {
+    "resourceType": "ExplanationOfBenefit",
+    "id": "sample-eob-001",
+    "status": "active",
+    "type": _CLAIM_TYPE_INSTITUTIONAL,
+    "outcome": "complete",
+    "claim": None,
+    "source": None
+}
+
 
 class InsuranceAdapter(Plugin, BaseAdapter):
     """
@@ -29,50 +87,89 @@ class InsuranceAdapter(Plugin, BaseAdapter):
     - Network provider lookup
     """
     
+    # Resource type -> handler method name; subclasses can extend these with
+    # {**InsuranceAdapter._FETCH_HANDLERS, "Foo": "_fetch_foo"}
+    _FETCH_HANDLERS: Dict[str, str] = {
+        "Claim": "_fetch_claims",
+        "Coverage": "_fetch_coverage",
+        "ExplanationOfBenefit": "_fetch_eob",
+    }
+    _SEND_HANDLERS: Dict[str, str] = {
+        "Claim": "_submit_claim",
+        "CoverageEligibilityRequest": "_check_eligibility",
+        "PriorAuthorization": "_request_authorization",
+    }
+    # Slow-changing resources served from the response cache
+    _CACHED_FETCHES = frozenset({"Coverage"})
+    
+    # "initialized" is Plugin state; Plugin and BaseAdapter keep no __dict__
+    __slots__ = ("initialized", "claims_endpoint", "auth_endpoint", "eligibility_endpoint",
+                 "payer_id", "_payer_ref", "_log", "_cache", "_inflight")
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
-        Plugin.__init__(self, config)
+        # BaseAdapter resets config, so it must run before Plugin stores it
         BaseAdapter.__init__(self, config.get("system_id", "insurance") if config else "insurance")
+        Plugin.__init__(self, config)
         self.claims_endpoint = ""
         self.auth_endpoint = ""
         self.eligibility_endpoint = ""
+        # Config-derived values used on every request, refreshed in initialize()
+        self.payer_id = self.config.get("payer_id")
+        self._payer_ref = f"Organization/{self.payer_id}"
+        self._log = logger.bind(system_id=self.system_id)
+        self._cache = TTLCache(maxsize=self.config.get("cache_maxsize", 10_000),
+                               ttl=self.config.get("cache_ttl", 300))
+        self._inflight = SingleFlight()
+    
+    _METADATA = PluginMetadata(
+        name="Insurance Adapter",
+        version="1.0.0",
+        plugin_type=PluginType.ADAPTER,
+        description=(
+            "Healthcare insurance company integration adapter for claims, "
+            "authorizations, and eligibility"
+        ),
+        author="BrainSAIT Healthcare Innovation Lab",
+        dependencies=["httpx", "fhir.resources"],
+        config_schema={
+            "system_id": {"type": "string", "required": True},
+            "base_url": {"type": "string", "required": True},
+            "api_key": {"type": "string", "required": True},
+            "payer_id": {"type": "string", "required": True},
+            "timeout": {"type": "integer", "default": 30},
+            "max_concurrency": {"type": "integer", "default": 20},
+            "cache_ttl": {"type": "integer", "default": 300},
+            "cache_maxsize": {"type": "integer", "default": 10000}
+        }
+    )
     
     def get_metadata(self) -> PluginMetadata:
         """Return plugin metadata"""
-        return PluginMetadata(
-            name="Insurance Adapter",
-            version="1.0.0",
-            plugin_type=PluginType.ADAPTER,
-            description="Healthcare insurance company integration adapter for claims, authorizations, and eligibility",
-            author="BrainSAIT Healthcare Innovation Lab",
-            dependencies=["httpx", "fhir.resources"],
-            config_schema={
-                "system_id": {"type": "string", "required": True},
-                "base_url": {"type": "string", "required": True},
-                "api_key": {"type": "string", "required": True},
-                "payer_id": {"type": "string", "required": True},
-                "timeout": {"type": "integer", "default": 30}
-            }
-        )
+        return self._METADATA
     
     async def initialize(self) -> bool:
         """Initialize the insurance adapter"""
         try:
             base_url = self.config.get("base_url", "")
+            self._open_client(base_url)
             self.claims_endpoint = f"{base_url}/claims"
             self.auth_endpoint = f"{base_url}/prior-authorization"
             self.eligibility_endpoint = f"{base_url}/eligibility"
+            self.payer_id = self.config.get("payer_id")
+            self._payer_ref = f"Organization/{self.payer_id}"
+            self._log = logger.bind(system_id=self.system_id, payer_id=self.payer_id)
             
-            logger.info("Insurance adapter initialized",
-                       system_id=self.system_id,
-                       payer_id=self.config.get("payer_id"))
+            self._log.info("Insurance adapter initialized")
             return True
         except Exception as e:
-            logger.error("Failed to initialize insurance adapter", error=str(e))
+            self._log.error("Failed to initialize insurance adapter", error=str(e))
             return False
     
     async def cleanup(self) -> bool:
         """Cleanup resources"""
-        logger.info("Insurance adapter cleanup", system_id=self.system_id)
+        await self._close_client()
+        self._cache.clear()
+        self._log.info("Insurance adapter cleanup")
         return True
     
     async def fetch_data(self, resource_type: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -84,22 +181,28 @@ class InsuranceAdapter(Plugin, BaseAdapter):
         - ExplanationOfBenefit: Fetch EOB records
         - Coverage: Fetch coverage/eligibility info
         - ClaimResponse: Fetch claim adjudication results
+        
+        Cached and coalesced results are copied for each caller, so the
+        returned resources may be mutated freely.
         """
-        logger.info("Fetching insurance data",
-                   system_id=self.system_id,
-                   resource_type=resource_type,
-                   params=params)
+        self._log.info("Fetching insurance data", resource_type=resource_type)
+        self._log.debug("Fetch parameters", params=params)
         
-        if resource_type == "Claim":
-            return await self._fetch_claims(params)
-        elif resource_type == "Coverage":
-            return await self._fetch_coverage(params)
-        elif resource_type == "ExplanationOfBenefit":
-            return await self._fetch_eob(params)
-        else:
-            logger.warning("Unsupported resource type for insurance",
-                          resource_type=resource_type)
+        handler = self._FETCH_HANDLERS.get(resource_type)
+        if handler is None:
+            self._log.warning("Unsupported resource type for insurance",
+                             resource_type=resource_type)
             return []
+        
+        # Identical concurrent fetches share one upstream call; slow-changing
+        # resources are also served from the cache
+        fetch = getattr(self, handler)
+        key = params_key(resource_type, params)
+        if key is None:
+            return await fetch(params)
+        if resource_type in self._CACHED_FETCHES:
+            return copy_resource(await self._cache.get_or_fetch(key, lambda: fetch(params)))
+        return copy_resource(await self._inflight.do(key, lambda: fetch(params)))
     
     async def send_data(self, resource_type: str, data: Dict[str, Any]) -> bool:
         """
@@ -110,20 +213,15 @@ class InsuranceAdapter(Plugin, BaseAdapter):
         - Request prior authorization
         - Update claim status
         """
-        logger.info("Sending data to insurance system",
-                   system_id=self.system_id,
-                   resource_type=resource_type)
+        self._log.info("Sending data to insurance system", resource_type=resource_type)
         
-        if resource_type == "Claim":
-            return await self._submit_claim(data)
-        elif resource_type == "CoverageEligibilityRequest":
-            return await self._check_eligibility(data)
-        elif resource_type == "PriorAuthorization":
-            return await self._request_authorization(data)
-        else:
-            logger.warning("Unsupported send operation",
-                          resource_type=resource_type)
+        handler = self._SEND_HANDLERS.get(resource_type)
+        if handler is None:
+            self._log.warning("Unsupported send operation",
+                             resource_type=resource_type)
             return False
+        
+        return await getattr(self, handler)(data)
     
     async def _fetch_claims(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Fetch claims from insurance system"""
@@ -131,104 +229,63 @@ class InsuranceAdapter(Plugin, BaseAdapter):
         claim_id = params.get("claim_id")
         patient_id = params.get("patient_id")
         
-        logger.info("Fetching claims",
-                   claim_id=claim_id,
-                   patient_id=patient_id)
+        self._log.info("Fetching claims",
+                      claim_id=claim_id,
+                      patient_id=patient_id)
         
-        return [{
-            "resourceType": "Claim",
-            "id": claim_id or "sample-claim-001",
-            "status": "active",
-            "type": {
-                "coding": [{
-                    "system": "http://terminology.hl7.org/CodeSystem/claim-type",
-                    "code": "institutional"
-                }]
-            },
-            "patient": {"reference": f"Patient/{patient_id}"},
-            "billablePeriod": {
-                "start": "2024-01-01",
-                "end": "2024-01-05"
-            },
-            "insurance": [{
-                "sequence": 1,
-                "focal": True,
-                "coverage": {"reference": "Coverage/sample-coverage"}
-            }],
-            "source": self.system_id
-        }]
+        return [fill_template(_CLAIM_TEMPLATE,
+                              id=claim_id or "sample-claim-001",
+                              patient={"reference": f"Patient/{patient_id}"},
+                              source=self.system_id)]
     
     async def _fetch_coverage(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Fetch coverage/eligibility information"""
         patient_id = params.get("patient_id")
         
-        logger.info("Fetching coverage", patient_id=patient_id)
+        self._log.info("Fetching coverage", patient_id=patient_id)
         
-        return [{
-            "resourceType": "Coverage",
-            "id": "sample-coverage-001",
-            "status": "active",
-            "beneficiary": {"reference": f"Patient/{patient_id}"},
-            "payor": [{
-                "reference": f"Organization/{self.config.get('payer_id')}"
-            }],
-            "period": {
-                "start": "2024-01-01",
-                "end": "2024-12-31"
-            },
-            "source": self.system_id
-        }]
+        return [fill_template(_COVERAGE_TEMPLATE,
+                              beneficiary={"reference": f"Patient/{patient_id}"},
+                              payor=[{"reference": self._payer_ref}],
+                              source=self.system_id)]
     
     async def _fetch_eob(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Fetch Explanation of Benefits"""
         claim_id = params.get("claim_id")
         
-        logger.info("Fetching EOB", claim_id=claim_id)
+        self._log.info("Fetching EOB", claim_id=claim_id)
         
-        return [{
-            "resourceType": "ExplanationOfBenefit",
-            "id": "sample-eob-001",
-            "status": "active",
-            "type": {
-                "coding": [{
-                    "system": "http://terminology.hl7.org/CodeSystem/claim-type",
-                    "code": "institutional"
-                }]
-            },
-            "outcome": "complete",
-            "claim": {"reference": f"Claim/{claim_id}"},
-            "source": self.system_id
-        }]
+        return [fill_template(_EOB_TEMPLATE,
+                              claim={"reference": f"Claim/{claim_id}"},
+                              source=self.system_id)]
     
     async def _submit_claim(self, data: Dict[str, Any]) -> bool:
         """Submit a claim to insurance system"""
-        logger.info("Submitting claim",
-                   system_id=self.system_id,
-                   claim_data=data)
+        self._log.info("Submitting claim", claim_id=data.get("id"))
         
         # Validate claim data
         if not data.get("patient") or not data.get("provider"):
-            logger.error("Invalid claim data - missing required fields")
+            self._log.error("Invalid claim data - missing required fields")
             return False
         
         # In production, make actual API call to insurance system
-        logger.info("Claim submitted successfully")
+        self._log.info("Claim submitted successfully")
         return True
     
     async def _check_eligibility(self, data: Dict[str, Any]) -> bool:
         """Check patient eligibility and benefits"""
-        logger.info("Checking eligibility",
-                   patient=data.get("patient"),
-                   service_type=data.get("service_type"))
+        self._log.info("Checking eligibility",
+                      patient=data.get("patient"),
+                      service_type=data.get("service_type"))
         
         # In production, call insurance eligibility API
         return True
     
     async def _request_authorization(self, data: Dict[str, Any]) -> bool:
         """Request prior authorization"""
-        logger.info("Requesting prior authorization",
-                   patient=data.get("patient"),
-                   service=data.get("service"))
+        self._log.info("Requesting prior authorization",
+                      patient=data.get("patient"),
+                      service=data.get("service"))
         
         # In production, submit prior authorization request
         return True
@@ -243,22 +300,40 @@ class ClaimsAutomationPlugin(Plugin):
     - Check for duplicate claims
     - Monitor claim status
     - Handle claim rejections
+    - Batch claim submissions to the payer
     """
     
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        super().__init__(config)
+        self._batcher = BatchQueue(self._submit_batch,
+                                   max_batch=self.config.get("max_batch", 50),
+                                   max_wait_ms=self.config.get("max_wait_ms", 20))
+    
+    _METADATA = PluginMetadata(
+        name="Claims Automation",
+        version="1.0.0",
+        plugin_type=PluginType.WORKFLOW,
+        description="Automated claims processing and validation workflows",
+        author="BrainSAIT Healthcare Innovation Lab",
+        config_schema={
+            "max_batch": {"type": "integer", "default": 50},
+            "max_wait_ms": {"type": "integer", "default": 20}
+        }
+    )
+    
     def get_metadata(self) -> PluginMetadata:
-        return PluginMetadata(
-            name="Claims Automation",
-            version="1.0.0",
-            plugin_type=PluginType.WORKFLOW,
-            description="Automated claims processing and validation workflows",
-            author="BrainSAIT Healthcare Innovation Lab"
-        )
+        """Return plugin metadata"""
+        return self._METADATA
     
     async def initialize(self) -> bool:
-        logger.info("Claims automation plugin initialized")
+        self._batcher.start()
+        logger.info("Claims automation plugin initialized",
+                   max_batch=self._batcher.max_batch,
+                   max_wait_ms=self._batcher.max_wait_ms)
         return True
     
     async def cleanup(self) -> bool:
+        await self._batcher.stop()
         logger.info("Claims automation plugin cleanup")
         return True
     
@@ -269,18 +344,7 @@ class ClaimsAutomationPlugin(Plugin):
         Returns:
             Processing result with validation status
         """
-        result = {
-            "valid": True,
-            "errors": [],
-            "warnings": []
-        }
-        
-        # Validate required fields
-        required_fields = ["patient", "provider", "diagnosis", "serviceDate"]
-        for field in required_fields:
-            if field not in claim_data:
-                result["valid"] = False
-                result["errors"].append(f"Missing required field: {field}")
+        result = self._validate_claim(claim_data)
         
         # Check for duplicate
         # In production, query database for similar claims
@@ -290,3 +354,64 @@ class ClaimsAutomationPlugin(Plugin):
                    errors=len(result["errors"]))
         
         return result
+    
+    async def submit_claim(self, claim_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate a claim and submit it to the payer
+        
+        While the plugin is initialized, submissions are queued and sent in
+        batches together with any other claims arriving at the same time.
+        
+        Returns:
+            Processing result with validation and submission status
+        """
+        return await self._batcher.submit(claim_data)
+    
+    async def process_claims_batch(self, claims: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Validate and submit many claims, coalescing them into payer batches
+        
+        Returns:
+            One processing result per claim, in the same order
+        """
+        return list(await asyncio.gather(*(self.submit_claim(claim) for claim in claims)))
+    
+    async def _submit_batch(self, claims: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Validate claims and submit the valid ones as one transaction Bundle"""
+        results = [self._validate_claim(claim) for claim in claims]
+        bundle = {
+            "resourceType": "Bundle",
+            "type": "transaction",
+            "entry": [
+                {"resource": claim, "request": {"method": "POST", "url": "Claim"}}
+                for claim, result in zip(claims, results) if result["valid"]
+            ]
+        }
+        
+        # In production, POST the bundle to the payer through the insurance adapter
+        for result in results:
+            result["submitted"] = result["valid"]
+        
+        logger.info("Claim batch submitted",
+                   claims=len(claims),
+                   submitted=len(bundle["entry"]))
+        
+        return results
+    
+    def _validate_claim(self, claim_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Check a claim for required fields"""
+        result = {
+            "valid": True,
+            "errors": [],
+            "warnings": []
+        }
+        
+        # Validate required fields with one set difference; errors keep field order
+        missing = _CLAIM_REQUIRED_FIELD_SET.difference(claim_data)
+        if missing:
+            result["valid"] = False
+            result["errors"] = [f"Missing required field: {field_name}"
+                                for field_name in _CLAIM_REQUIRED_FIELDS
+                                if field_name in missing]
+        
+        return result
@@ -9,13 +9,133 @@ Provides pre-built adapters and workflows for healthcare providers including:
 - Quality improvement
 """
 
-from typing import Any, Dict, List, Optional
+from datetime import date
+import functools
+from typing import Any, Dict, List, Optional, Tuple
 from pyheart.core.plugins import Plugin, PluginMetadata, PluginType
-from pyheart.core.integration import BaseAdapter
+from pyheart.core.integration import BaseAdapter, copy_resource, fill_template
+from pyheart.core.batching import BatchQueue
+from pyheart.core.caching import SingleFlight, TTLCache, params_key
+import numpy as np
 import structlog
 
 logger = structlog.get_logger()
 
+# PDC below this is conventionally reported as non-adherent
+_ADHERENCE_THRESHOLD = 0.8
+
+# Coded values shared by the resource templates
+_GLUCOSE_CODE: Dict[str, Any] = {
+    "coding": [{
+        "system": "http://loinc.org",
+        "code": "2339-0",
+        "display": "Glucose"
+    }]
+}
+
+_CONDITION_ACTIVE: Dict[str, Any] = {
+    "coding": [{
+        "system": "http://terminology.hl7.org/CodeSystem/condition-clinical",
+        "code": "active"
+    }]
+}
+
+_DIABETES_CODE: Dict[str, Any] = {
+    "coding": [{
+        "system": "http://snomed.info/sct",
+        "code": "73211009",
+        "display": "Diabetes mellitus"
+    }]
+}
+
+_METFORMIN_CODE: Dict[str, Any] = {
+    "coding": [{
+        "system": "http://www.nlm.nih.gov/research/umls/rxnorm",
+        "code": "860975",
+        "display": "Metformin 500 MG"
+    }]
+}
+
+_REFERRAL_CATEGORY: Dict[str, Any] = {
+    "coding": [{
+        "system": "http://snomed.info/sct",
+        "code": "3457005",
+        "display": "Referral"
+    }]
+}
+
+_OBSERVATION_CATEGORY_SYSTEM = "http://terminology.hl7.org/CodeSystem/observation-category"
+
+# Resource templates for simulated responses; per-call fields are None and filled
+# with fill_template(), which copies the nested parts so results never share them
+_PATIENT_TEMPLATE: Dict[str, Any] = {
+    "resourceType": "Patient",
+    "id": None,
+    "active": True,
+    "name": [{
+        "use": "official",
+        "family": "Smith",
+        "given": ["John"]
+    }],
+    "gender": "male",
+    "birthDate": "1980-01-01",
+    "source": None
+}
+
+_OBSERVATION_TEMPLATE: Dict[str, Any] = {
+    "resourceType": "Observation",
+    "id": "obs-001",
+    "status": "final",
+    "category": None,
+    "code": _GLUCOSE_CODE,
+    "subject": None,
+    "valueQuantity": {
+        "value": 95,
+        "unit": "mg/dL"
+    },
+    "source": None
+}
+
+_CONDITION_TEMPLATE: Dict[str, Any] = {
+    "resourceType": "Condition",
+    "id": "cond-001",
+    "clinicalStatus": _CONDITION_ACTIVE,
+    "code": _DIABETES_CODE,
+    "subject": None,
+    "source": None
+}
+
+_MEDICATION_REQUEST_TEMPLATE: Dict[str, Any] = {
+    "resourceType": "MedicationRequest",
+    "id": "medrx-001",
+    "status": "active",
+    "intent": "order",
+    "medicationCodeableConcept": _METFORMIN_CODE,
+    "subject": None,
+    "source": None
+}
+
+_REFERRAL_TEMPLATE: Dict[str, Any] = {
+    "resourceType": "ServiceRequest",
+    "status": "active",
+    "intent": "order",
+    "category": [_REFERRAL_CATEGORY],
+    "subject": None,
+    "reasonCode": None,
+    "specialty": None,
+    "priority": "routine"
+}
+
+_APPOINTMENT_TEMPLATE: Dict[str, Any] = {
+    "resourceType": "Appointment",
+    "id": "appt-001",
+    "status": "booked",
+    "start": "2024-02-01T09:00:00Z",
+    "end": "2024-02-01T09:30:00Z",
+    "participant": None,
+    "source": None
+}
+
 
 class ProviderAdapter(Plugin, BaseAdapter):
     """
@@ -29,53 +149,88 @@ class ProviderAdapter(Plugin, BaseAdapter):
     - Referral management
     """
     
+    # Resource type -> handler method name; subclasses can extend these with
+    # {**ProviderAdapter._FETCH_HANDLERS, "Foo": "_fetch_foo"}
+    _FETCH_HANDLERS: Dict[str, str] = {
+        "Patient": "_fetch_patients",
+        "Observation": "_fetch_observations",
+        "Condition": "_fetch_conditions",
+        "MedicationRequest": "_fetch_medications",
+        "Appointment": "_fetch_appointments",
+    }
+    _SEND_HANDLERS: Dict[str, str] = {
+        "Patient": "_create_update_patient",
+        "Encounter": "_document_encounter",
+        "ServiceRequest": "_submit_order",
+        "Appointment": "_schedule_appointment",
+    }
+    # Demographics and problem lists change slowly; observations are always fetched fresh
+    _CACHED_FETCHES = frozenset({"Patient", "Condition"})
+    
+    __slots__ = ("initialized", "ehr_type", "practice_id", "patient_endpoint",
+                 "clinical_endpoint", "_log", "_cache", "_inflight")
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
-        Plugin.__init__(self, config)
+        # BaseAdapter resets config, so it must run before Plugin stores it
         BaseAdapter.__init__(self, config.get("system_id", "provider") if config else "provider")
+        Plugin.__init__(self, config)
         self.ehr_type = ""
+        self.practice_id: Optional[str] = None
         self.patient_endpoint = ""
         self.clinical_endpoint = ""
+        self._log = logger.bind(system_id=self.system_id)
+        self._cache = TTLCache(maxsize=self.config.get("cache_maxsize", 10_000),
+                               ttl=self.config.get("cache_ttl", 300))
+        self._inflight = SingleFlight()
+    
+    _METADATA = PluginMetadata(
+        name="Provider Adapter",
+        version="1.0.0",
+        plugin_type=PluginType.ADAPTER,
+        description="Healthcare provider integration for EHR access and clinical workflows",
+        author="BrainSAIT Healthcare Innovation Lab",
+        dependencies=["httpx", "fhir.resources"],
+        config_schema={
+            "system_id": {"type": "string", "required": True},
+            "ehr_type": {"type": "string", "required": True,
+                        "enum": ["epic", "cerner", "allscripts", "athenahealth", "generic"]},
+            "base_url": {"type": "string", "required": True},
+            "client_id": {"type": "string", "required": True},
+            "client_secret": {"type": "string", "required": True},
+            "practice_id": {"type": "string", "required": False},
+            "max_concurrency": {"type": "integer", "default": 20},
+            "cache_ttl": {"type": "integer", "default": 300},
+            "cache_maxsize": {"type": "integer", "default": 10000}
+        }
+    )
     
     def get_metadata(self) -> PluginMetadata:
         """Return plugin metadata"""
-        return PluginMetadata(
-            name="Provider Adapter",
-            version="1.0.0",
-            plugin_type=PluginType.ADAPTER,
-            description="Healthcare provider integration for EHR access and clinical workflows",
-            author="BrainSAIT Healthcare Innovation Lab",
-            dependencies=["httpx", "fhir.resources"],
-            config_schema={
-                "system_id": {"type": "string", "required": True},
-                "ehr_type": {"type": "string", "required": True,
-                            "enum": ["epic", "cerner", "allscripts", "athenahealth", "generic"]},
-                "base_url": {"type": "string", "required": True},
-                "client_id": {"type": "string", "required": True},
-                "client_secret": {"type": "string", "required": True},
-                "practice_id": {"type": "string", "required": False}
-            }
-        )
+        return self._METADATA
     
     async def initialize(self) -> bool:
         """Initialize the provider adapter"""
         try:
             self.ehr_type = self.config.get("ehr_type", "generic")
+            self.practice_id = self.config.get("practice_id")
             base_url = self.config.get("base_url", "")
+            self._open_client(base_url)
             self.patient_endpoint = f"{base_url}/Patient"
             self.clinical_endpoint = f"{base_url}/api"
             
-            logger.info("Provider adapter initialized",
-                       system_id=self.system_id,
-                       ehr_type=self.ehr_type,
-                       practice_id=self.config.get("practice_id"))
+            self._log = logger.bind(system_id=self.system_id, ehr_type=self.ehr_type)
+            
+            self._log.info("Provider adapter initialized", practice_id=self.practice_id)
             return True
         except Exception as e:
-            logger.error("Failed to initialize provider adapter", error=str(e))
+            self._log.error("Failed to initialize provider adapter", error=str(e))
             return False
     
     async def cleanup(self) -> bool:
         """Cleanup resources"""
-        logger.info("Provider adapter cleanup", system_id=self.system_id)
+        await self._close_client()
+        self._cache.clear()
+        self._log.info("Provider adapter cleanup")
         return True
     
     async def fetch_data(self, resource_type: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -89,26 +244,28 @@ class ProviderAdapter(Plugin, BaseAdapter):
         - MedicationRequest: Prescriptions
         - Appointment: Scheduled visits
         - DocumentReference: Clinical documents
+        
+        Cached and coalesced results are copied for each caller, so the
+        returned resources may be mutated freely.
         """
-        logger.info("Fetching provider data",
-                   system_id=self.system_id,
-                   resource_type=resource_type,
-                   params=params)
-        
-        if resource_type == "Patient":
-            return await self._fetch_patients(params)
-        elif resource_type == "Observation":
-            return await self._fetch_observations(params)
-        elif resource_type == "Condition":
-            return await self._fetch_conditions(params)
-        elif resource_type == "MedicationRequest":
-            return await self._fetch_medications(params)
-        elif resource_type == "Appointment":
-            return await self._fetch_appointments(params)
-        else:
-            logger.warning("Unsupported resource type for provider",
-                          resource_type=resource_type)
+        self._log.info("Fetching provider data", resource_type=resource_type)
+        self._log.debug("Fetch parameters", params=params)
+        
+        handler = self._FETCH_HANDLERS.get(resource_type)
+        if handler is None:
+            self._log.warning("Unsupported resource type for provider",
+                             resource_type=resource_type)
             return []
+        
+        # Identical concurrent fetches share one upstream call; slow-changing
+        # resources are also served from the cache
+        fetch = getattr(self, handler)
+        key = params_key(resource_type, params)
+        if key is None:
+            return await fetch(params)
+        if resource_type in self._CACHED_FETCHES:
+            return copy_resource(await self._cache.get_or_fetch(key, lambda: fetch(params)))
+        return copy_resource(await self._inflight.do(key, lambda: fetch(params)))
     
     async def send_data(self, resource_type: str, data: Dict[str, Any]) -> bool:
         """
@@ -120,184 +277,113 @@ class ProviderAdapter(Plugin, BaseAdapter):
         - Submit orders
         - Schedule appointments
         """
-        logger.info("Sending data to provider system",
-                   system_id=self.system_id,
-                   resource_type=resource_type)
-        
-        if resource_type == "Patient":
-            return await self._create_update_patient(data)
-        elif resource_type == "Encounter":
-            return await self._document_encounter(data)
-        elif resource_type == "ServiceRequest":
-            return await self._submit_order(data)
-        elif resource_type == "Appointment":
-            return await self._schedule_appointment(data)
-        else:
-            logger.warning("Unsupported send operation",
-                          resource_type=resource_type)
+        self._log.info("Sending data to provider system", resource_type=resource_type)
+        
+        handler = self._SEND_HANDLERS.get(resource_type)
+        if handler is None:
+            self._log.warning("Unsupported send operation",
+                             resource_type=resource_type)
             return False
+        
+        return await getattr(self, handler)(data)
     
     async def _fetch_patients(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Fetch patient records"""
         patient_id = params.get("patient_id")
         name = params.get("name")
         
-        logger.info("Fetching patients",
-                   patient_id=patient_id,
-                   name=name)
-        
-        return [{
-            "resourceType": "Patient",
-            "id": patient_id or "sample-patient-001",
-            "active": True,
-            "name": [{
-                "use": "official",
-                "family": "Smith",
-                "given": ["John"]
-            }],
-            "gender": "male",
-            "birthDate": "1980-01-01",
-            "source": self.system_id
-        }]
+        self._log.info("Fetching patients",
+                      patient_id=patient_id,
+                      name=name)
+        
+        return [fill_template(_PATIENT_TEMPLATE,
+                              id=patient_id or "sample-patient-001",
+                              source=self.system_id)]
     
     async def _fetch_observations(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Fetch clinical observations (labs, vitals)"""
         patient_id = params.get("patient_id")
         category = params.get("category", "laboratory")
         
-        logger.info("Fetching observations",
-                   patient_id=patient_id,
-                   category=category)
-        
-        return [{
-            "resourceType": "Observation",
-            "id": "obs-001",
-            "status": "final",
-            "category": [{
-                "coding": [{
-                    "system": "http://terminology.hl7.org/CodeSystem/observation-category",
-                    "code": category
-                }]
-            }],
-            "code": {
-                "coding": [{
-                    "system": "http://loinc.org",
-                    "code": "2339-0",
-                    "display": "Glucose"
-                }]
-            },
-            "subject": {"reference": f"Patient/{patient_id}"},
-            "valueQuantity": {
-                "value": 95,
-                "unit": "mg/dL"
-            },
-            "source": self.system_id
-        }]
+        self._log.info("Fetching observations",
+                      patient_id=patient_id,
+                      category=category)
+        
+        return [fill_template(_OBSERVATION_TEMPLATE,
+                              category=_observation_category(category),
+                              subject={"reference": f"Patient/{patient_id}"},
+                              source=self.system_id)]
     
     async def _fetch_conditions(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Fetch patient conditions/diagnoses"""
         patient_id = params.get("patient_id")
         
-        logger.info("Fetching conditions", patient_id=patient_id)
-        
-        return [{
-            "resourceType": "Condition",
-            "id": "cond-001",
-            "clinicalStatus": {
-                "coding": [{
-                    "system": "http://terminology.hl7.org/CodeSystem/condition-clinical",
-                    "code": "active"
-                }]
-            },
-            "code": {
-                "coding": [{
-                    "system": "http://snomed.info/sct",
-                    "code": "73211009",
-                    "display": "Diabetes mellitus"
-                }]
-            },
-            "subject": {"reference": f"Patient/{patient_id}"},
-            "source": self.system_id
-        }]
+        self._log.info("Fetching conditions", patient_id=patient_id)
+        
+        return [fill_template(_CONDITION_TEMPLATE,
+                              subject={"reference": f"Patient/{patient_id}"},
+                              source=self.system_id)]
     
     async def _fetch_medications(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Fetch patient medications"""
         patient_id = params.get("patient_id")
         
-        logger.info("Fetching medications", patient_id=patient_id)
-        
-        return [{
-            "resourceType": "MedicationRequest",
-            "id": "medrx-001",
-            "status": "active",
-            "intent": "order",
-            "medicationCodeableConcept": {
-                "coding": [{
-                    "system": "http://www.nlm.nih.gov/research/umls/rxnorm",
-                    "code": "860975",
-                    "display": "Metformin 500 MG"
-                }]
-            },
-            "subject": {"reference": f"Patient/{patient_id}"},
-            "source": self.system_id
-        }]
+        self._log.info("Fetching medications", patient_id=patient_id)
+        
+        return [fill_template(_MEDICATION_REQUEST_TEMPLATE,
+                              subject={"reference": f"Patient/{patient_id}"},
+                              source=self.system_id)]
     
     async def _fetch_appointments(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Fetch appointments"""
         patient_id = params.get("patient_id")
         
-        logger.info("Fetching appointments", patient_id=patient_id)
-        
-        return [{
-            "resourceType": "Appointment",
-            "id": "appt-001",
-            "status": "booked",
-            "start": "2024-02-01T09:00:00Z",
-            "end": "2024-02-01T09:30:00Z",
-            "participant": [{
-                "actor": {"reference": f"Patient/{patient_id}"},
-                "status": "accepted"
-            }],
-            "source": self.system_id
-        }]
+        self._log.info("Fetching appointments", patient_id=patient_id)
+        
+        return [fill_template(_APPOINTMENT_TEMPLATE,
+                              participant=[{
+                                  "actor": {"reference": f"Patient/{patient_id}"},
+                                  "status": "accepted"
+                              }],
+                              source=self.system_id)]
     
     async def _create_update_patient(self, data: Dict[str, Any]) -> bool:
         """Create or update patient record"""
-        logger.info("Creating/updating patient",
-                   patient_id=data.get("id"))
+        self._log.info("Creating/updating patient",
+                      patient_id=data.get("id"))
         
         # Validate patient data
         if not data.get("name"):
-            logger.error("Invalid patient data - missing name")
+            self._log.error("Invalid patient data - missing name")
             return False
         
         # In production, call EHR API
-        logger.info("Patient record updated successfully")
+        self._log.info("Patient record updated successfully")
         return True
     
     async def _document_encounter(self, data: Dict[str, Any]) -> bool:
         """Document clinical encounter"""
-        logger.info("Documenting encounter",
-                   patient=data.get("subject"),
-                   type=data.get("type"))
+        self._log.info("Documenting encounter",
+                      patient=data.get("subject"),
+                      type=data.get("type"))
         
         # In production, submit to EHR
         return True
     
     async def _submit_order(self, data: Dict[str, Any]) -> bool:
         """Submit service order (lab, imaging, etc.)"""
-        logger.info("Submitting order",
-                   patient=data.get("subject"),
-                   code=data.get("code"))
+        self._log.info("Submitting order",
+                      patient=data.get("subject"),
+                      code=data.get("code"))
         
         # In production, submit to EHR order system
         return True
     
     async def _schedule_appointment(self, data: Dict[str, Any]) -> bool:
         """Schedule appointment"""
-        logger.info("Scheduling appointment",
-                   patient=data.get("participant"),
-                   start=data.get("start"))
+        self._log.info("Scheduling appointment",
+                      patient=data.get("participant"),
+                      start=data.get("start"))
         
         # In production, call scheduling API
         return True
@@ -314,14 +400,17 @@ class CareCoordinationPlugin(Plugin):
     - Transition of care
     """
     
+    _METADATA = PluginMetadata(
+        name="Care Coordination",
+        version="1.0.0",
+        plugin_type=PluginType.WORKFLOW,
+        description="Automated care coordination and referral management workflows",
+        author="BrainSAIT Healthcare Innovation Lab"
+    )
+    
     def get_metadata(self) -> PluginMetadata:
-        return PluginMetadata(
-            name="Care Coordination",
-            version="1.0.0",
-            plugin_type=PluginType.WORKFLOW,
-            description="Automated care coordination and referral management workflows",
-            author="BrainSAIT Healthcare Innovation Lab"
-        )
+        """Return plugin metadata"""
+        return self._METADATA
     
     async def initialize(self) -> bool:
         logger.info("Care coordination plugin initialized")
@@ -344,26 +433,25 @@ class CareCoordinationPlugin(Plugin):
             
         Returns:
             Referral record
+            
+        Raises:
+            ValueError: If the patient id, specialty or reason is missing
         """
-        referral = {
-            "resourceType": "ServiceRequest",
-            "status": "active",
-            "intent": "order",
-            "category": [{
-                "coding": [{
-                    "system": "http://snomed.info/sct",
-                    "code": "3457005",
-                    "display": "Referral"
-                }]
-            }],
-            "subject": {"reference": f"Patient/{patient_data.get('id')}"},
-            "reasonCode": [{"text": reason}],
-            "specialty": specialty,
-            "priority": "routine"
-        }
+        patient_id = patient_data.get("id")
+        if not patient_id:
+            raise ValueError("Referral requires a patient id")
+        if not specialty:
+            raise ValueError("Referral requires a specialty")
+        if not reason:
+            raise ValueError("Referral requires a reason")
+        
+        referral = fill_template(_REFERRAL_TEMPLATE,
+                                 subject={"reference": f"Patient/{patient_id}"},
+                                 reasonCode=[{"text": reason}],
+                                 specialty=specialty)
         
         logger.info("Referral created",
-                   patient=patient_data.get('id'),
+                   patient=patient_id,
                    specialty=specialty)
         
         return referral
@@ -380,20 +468,35 @@ class PatientEngagementPlugin(Plugin):
     - Follow-up scheduling
     """
     
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        super().__init__(config)
+        self._reminders = BatchQueue(self._send_reminder_batch,
+                                     max_batch=self.config.get("reminder_batch_size", 50),
+                                     max_wait_ms=self.config.get("reminder_max_wait_ms", 250))
+    
+    _METADATA = PluginMetadata(
+        name="Patient Engagement",
+        version="1.0.0",
+        plugin_type=PluginType.WORKFLOW,
+        description="Automated patient engagement and communication workflows",
+        author="BrainSAIT Healthcare Innovation Lab",
+        config_schema={
+            "reminder_batch_size": {"type": "integer", "default": 50},
+            "reminder_max_wait_ms": {"type": "integer", "default": 250}
+        }
+    )
+    
     def get_metadata(self) -> PluginMetadata:
-        return PluginMetadata(
-            name="Patient Engagement",
-            version="1.0.0",
-            plugin_type=PluginType.WORKFLOW,
-            description="Automated patient engagement and communication workflows",
-            author="BrainSAIT Healthcare Innovation Lab"
-        )
+        """Return plugin metadata"""
+        return self._METADATA
     
     async def initialize(self) -> bool:
+        self._reminders.start()
         logger.info("Patient engagement plugin initialized")
         return True
     
     async def cleanup(self) -> bool:
+        await self._reminders.stop()
         logger.info("Patient engagement plugin cleanup")
         return True
     
@@ -406,6 +509,9 @@ class PatientEngagementPlugin(Plugin):
             patient_id: Patient identifier
             appointment_data: Appointment details
             
+        Reminders sent while the plugin is initialized are queued and
+        delivered together with others through the gateway's bulk endpoint.
+        
         Returns:
             True if reminder sent successfully
         """
@@ -413,27 +519,65 @@ class PatientEngagementPlugin(Plugin):
                    patient=patient_id,
                    appointment_time=appointment_data.get("start"))
         
-        # In production, integrate with SMS/email service
-        return True
+        return await self._reminders.submit((patient_id, appointment_data))
+    
+    async def _send_reminder_batch(self, reminders: List[Tuple[str, Dict[str, Any]]]) -> List[bool]:
+        """Deliver a batch of reminders in one messaging gateway request"""
+        messages = [
+            {"to": patient_id, "appointment": appointment_data.get("start")}
+            for patient_id, appointment_data in reminders
+        ]
+        
+        # In production, POST the messages to the SMS/email service's bulk endpoint
+        logger.info("Appointment reminders sent", count=len(messages))
+        return [True] * len(messages)
     
     async def check_medication_adherence(self, patient_id: str,
-                                        medications: List[Dict[str, Any]]) -> Dict[str, Any]:
+                                        medications: List[Dict[str, Any]],
+                                        as_of: Optional[date] = None) -> Dict[str, Any]:
         """
         Check medication adherence
         
+        Each medication may carry a "fills" list of {"date", "daysSupply"}
+        entries taken from refill or claims history. Adherence is the
+        proportion of days covered (PDC) from the first fill up to as_of;
+        medications without fills are tracked but not scored.
+        
         Args:
             patient_id: Patient identifier
             medications: List of current medications
+            as_of: End of the observation window, defaults to today
             
         Returns:
             Adherence report
         """
-        # In production, analyze refill history and claims data
+        period_end = as_of or date.today()
+        scores = []
+        alerts = []
+        
+        for medication in medications:
+            fills = medication.get("fills")
+            if not fills:
+                continue
+            
+            pdc = _proportion_of_days_covered(fills, period_end)
+            if pdc is None:
+                continue
+            scores.append(pdc)
+            
+            if pdc < _ADHERENCE_THRESHOLD:
+                coding = medication.get("medicationCodeableConcept", {}).get("coding", [{}])
+                alerts.append({
+                    "medication": coding[0].get("display", medication.get("id")),
+                    "pdc": pdc
+                })
+        
         report = {
             "patient": patient_id,
-            "adherence_score": 0.85,
+            "adherence_score": float(np.mean(scores)) if scores else None,
             "medications_tracked": len(medications),
-            "alerts": []
+            "medications_scored": len(scores),
+            "alerts": alerts
         }
         
         logger.info("Medication adherence checked",
@@ -441,3 +585,48 @@ class PatientEngagementPlugin(Plugin):
                    score=report["adherence_score"])
         
         return report
+
+
+def _proportion_of_days_covered(fills: List[Dict[str, Any]],
+                                period_end: date) -> Optional[float]:
+    """
+    Proportion of days covered by a refill history
+    
+    Overlapping supply is counted once, so early refills do not push the
+    score above 1.0.
+    
+    Args:
+        fills: Refill records with "date" (ISO date) and "daysSupply"
+        period_end: End of the observation window (exclusive)
+        
+    Returns:
+        PDC between 0.0 and 1.0, or None if the window is empty
+    """
+    starts = np.array([str(fill["date"])[:10] for fill in fills], dtype="datetime64[D]")
+    supply = np.array([fill.get("daysSupply", 0) for fill in fills], dtype=np.int32)
+    order = np.argsort(starts, kind="stable")
+    starts = starts[order]
+    supply = supply[order]
+    
+    end = np.datetime64(period_end, "D")
+    window = int((end - starts[0]).astype(np.int64))
+    if window <= 0:
+        return None
+    
+    # Each fill only covers days past the furthest point reached by earlier fills
+    ends = np.minimum(starts + supply, end)
+    reached = np.concatenate((starts[:1], np.maximum.accumulate(ends)[:-1]))
+    covered = np.clip((ends - np.maximum(starts, reached)).astype(np.int64), 0, None)
+    
+    return float(covered.sum()) / window
+
+
+@functools.lru_cache(maxsize=32)
+def _observation_category(category: str) -> List[Dict[str, Any]]:
+    """Observation.category for a category code, built once per code; copy before mutating"""
+    return [{
+        "coding": [{
+            "system": _OBSERVATION_CATEGORY_SYSTEM,
+            "code": category
+        }]
+    }]
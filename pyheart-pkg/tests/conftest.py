@@ -0,0 +1,87 @@
+"""
+Shared fixtures for the plugin tests
+"""
+
+import asyncio
+from typing import AsyncIterator, Dict, Iterator
+
+import pytest
+import pytest_asyncio
+from pyheart.core.plugins import Plugin, PluginRegistry
+from pyheart.plugins.insurance import InsuranceAdapter
+from pyheart.plugins.government import GovernmentAdapter
+from pyheart.plugins.provider import ProviderAdapter
+
+INSURANCE_CONFIG = {
+    "system_id": "test",
+    "base_url": "https://test.com",
+    "api_key": "key",
+    "payer_id": "TEST"
+}
+
+GOVERNMENT_CONFIG = {
+    "system_id": "test",
+    "agency_type": "public_health",
+    "base_url": "https://test.com",
+    "jurisdiction": "CA"
+}
+
+PROVIDER_CONFIG = {
+    "system_id": "test",
+    "ehr_type": "epic",
+    "base_url": "https://test.com",
+    "client_id": "client",
+    "client_secret": "secret"
+}
+
+
+# Adapters are built per test: tests initialize, clean up and swap the HTTP
+# client on them, so a shared instance would leak state between tests.
+# Their metadata is a class-level singleton and is not rebuilt.
+
+@pytest.fixture
+def insurance_adapter() -> InsuranceAdapter:
+    """Uninitialized insurance adapter with the standard test config"""
+    return InsuranceAdapter(config=dict(INSURANCE_CONFIG))
+
+
+@pytest.fixture
+def government_adapter() -> GovernmentAdapter:
+    """Uninitialized public health agency adapter with the standard test config"""
+    return GovernmentAdapter(config=dict(GOVERNMENT_CONFIG))
+
+
+@pytest.fixture
+def provider_adapter() -> ProviderAdapter:
+    """Uninitialized EHR adapter with the standard test config"""
+    return ProviderAdapter(config=dict(PROVIDER_CONFIG))
+
+
+@pytest.fixture(scope="module")
+def _shared_registry() -> PluginRegistry:
+    return PluginRegistry()
+
+
+@pytest.fixture
+def registry(_shared_registry: PluginRegistry) -> Iterator[PluginRegistry]:
+    """Empty plugin registry, reused across a test module and cleared after each test"""
+    yield _shared_registry
+    _shared_registry.clear()
+
+
+@pytest_asyncio.fixture(scope="module")
+async def initialized_plugins() -> AsyncIterator[Dict[str, Plugin]]:
+    """
+    Adapters with the standard test configs, initialized together once per module
+    
+    Shared between tests, so only use them for read-only calls; tests that
+    reconfigure or clean up an adapter should take the per-test fixtures.
+    """
+    plugins: Dict[str, Plugin] = {
+        "insurance": InsuranceAdapter(config=dict(INSURANCE_CONFIG)),
+        "government": GovernmentAdapter(config=dict(GOVERNMENT_CONFIG)),
+        "provider": ProviderAdapter(config=dict(PROVIDER_CONFIG))
+    }
+    await asyncio.gather(*(plugin.initialize() for plugin in plugins.values()))
+    yield plugins
+    await asyncio.gather(*(plugin.cleanup() for plugin in plugins.values()))
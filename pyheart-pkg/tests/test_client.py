@@ -1,7 +1,9 @@
 """Tests for FHIR client."""
 
+import httpx
+import orjson
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from pyheart.core.client import FHIRClient, ClientConfig
 
 
@@ -24,6 +26,23 @@ def test_fhir_client_initialization():
     assert str(client.config.base_url) == "https://fhir.example.com/"
 
 
+@patch('httpx.AsyncClient')
+def test_connection_pool_limits(mock_async_client_class):
+    """Test that the async client shares one configured connection pool."""
+    config = ClientConfig(
+        base_url="https://fhir.example.com",
+        max_connections=10,
+        max_keepalive_connections=5
+    )
+    FHIRClient(config)
+    
+    mock_async_client_class.assert_called_once()
+    limits = mock_async_client_class.call_args.kwargs["limits"]
+    assert limits == httpx.Limits(max_connections=10,
+                                  max_keepalive_connections=5,
+                                  keepalive_expiry=60.0)
+
+
 @patch('httpx.Client')
 def test_get_patient_headers(mock_client_class):
     """Test FHIR client headers."""
@@ -47,11 +66,11 @@ def test_search_resources(mock_client_class):
     """Test resource search."""
     mock_client = Mock()
     mock_response = Mock()
-    mock_response.json.return_value = {
+    mock_response.content = orjson.dumps({
         "resourceType": "Bundle",
         "total": 1,
         "entry": [{"resource": {"resourceType": "Patient", "id": "123"}}]
-    }
+    })
     mock_response.raise_for_status.return_value = None
     mock_client.get.return_value = mock_response
     mock_client_class.return_value = mock_client
@@ -64,16 +83,77 @@ def test_search_resources(mock_client_class):
     mock_client.get.assert_called_once()
 
 
+@patch('httpx.Client')
+def test_next_page(mock_client_class):
+    """Test following a search bundle's next link."""
+    mock_client = Mock()
+    mock_response = Mock()
+    mock_response.content = orjson.dumps({
+        "resourceType": "Bundle",
+        "entry": [{"resource": {"resourceType": "Patient", "id": "456"}}]
+    })
+    mock_response.raise_for_status.return_value = None
+    mock_client.get.return_value = mock_response
+    mock_client_class.return_value = mock_client
+    
+    client = FHIRClient("https://fhir.example.com")
+    next_url = "https://fhir.example.com?_getpages=abc&_getpagesoffset=50"
+    bundle = {
+        "resourceType": "Bundle",
+        "link": [
+            {"relation": "self", "url": "https://fhir.example.com/Patient"},
+            {"relation": "next", "url": next_url}
+        ]
+    }
+    
+    result = client.next_page(bundle)
+    
+    assert result["entry"][0]["resource"]["id"] == "456"
+    mock_client.get.assert_called_once_with(next_url)
+    
+    # The last page has no next link
+    assert client.next_page(result) is None
+    mock_client.get.assert_called_once()
+
+
+@pytest.mark.asyncio
+@patch('httpx.AsyncClient')
+async def test_next_page_async(mock_async_client_class):
+    """Test following a search bundle's next link asynchronously."""
+    mock_async_client = Mock()
+    mock_response = Mock()
+    mock_response.content = orjson.dumps({
+        "resourceType": "Bundle",
+        "entry": [{"resource": {"resourceType": "Patient", "id": "456"}}]
+    })
+    mock_response.raise_for_status.return_value = None
+    mock_async_client.get = AsyncMock(return_value=mock_response)
+    mock_async_client_class.return_value = mock_async_client
+    
+    client = FHIRClient("https://fhir.example.com")
+    next_url = "https://fhir.example.com?_getpages=abc&_getpagesoffset=50"
+    bundle = {"resourceType": "Bundle", "link": [{"relation": "next", "url": next_url}]}
+    
+    result = await client.next_page_async(bundle)
+    
+    assert result["entry"][0]["resource"]["id"] == "456"
+    mock_async_client.get.assert_awaited_once_with(next_url)
+    
+    # The last page has no next link
+    assert await client.next_page_async(result) is None
+    mock_async_client.get.assert_awaited_once()
+
+
 @patch('httpx.Client')
 def test_create_resource(mock_client_class):
     """Test resource creation."""
     mock_client = Mock()
     mock_response = Mock()
-    mock_response.json.return_value = {
+    mock_response.content = orjson.dumps({
         "resourceType": "Patient",
         "id": "123",
         "name": [{"family": "Doe", "given": ["John"]}]
-    }
+    })
     mock_response.raise_for_status.return_value = None
     mock_client.post.return_value = mock_response
     mock_client_class.return_value = mock_client
@@ -88,4 +168,5 @@ def test_create_resource(mock_client_class):
     
     assert result["resourceType"] == "Patient"
     assert result["id"] == "123"
-    mock_client.post.assert_called_once()
\ No newline at end of file
+    mock_client.post.assert_called_once()
+    assert orjson.loads(mock_client.post.call_args.kwargs["content"]) == patient_data
\ No newline at end of file
@@ -2,68 +2,50 @@
 Tests for the plugin system
 """
 
+import asyncio
+import dataclasses
+
+import httpx
+import orjson
 import pytest
 from pyheart.core.plugins import (
     Plugin, PluginManager, PluginRegistry, PluginType, PluginMetadata
 )
 from pyheart.plugins.insurance import InsuranceAdapter, ClaimsAutomationPlugin
-from pyheart.plugins.government import GovernmentAdapter, PublicHealthReportingPlugin
-from pyheart.plugins.provider import ProviderAdapter, CareCoordinationPlugin
+from pyheart.plugins.government import (
+    GovernmentAdapter, PublicHealthReportingPlugin, ImmunizationRegistryPlugin
+)
+from pyheart.plugins.provider import (
+    ProviderAdapter, CareCoordinationPlugin, PatientEngagementPlugin
+)
 
 
 class TestPluginRegistry:
     """Test plugin registry functionality"""
     
-    def test_register_plugin(self):
+    def test_register_plugin(self, insurance_adapter, registry):
         """Test plugin registration"""
-        registry = PluginRegistry()
-        
-        # Create a test plugin
-        plugin = InsuranceAdapter(config={
-            "system_id": "test",
-            "base_url": "https://test.com",
-            "api_key": "test-key",
-            "payer_id": "TEST-001"
-        })
-        
         # Register plugin
-        success = registry.register_plugin("test_insurance", plugin)
+        success = registry.register_plugin("test_insurance", insurance_adapter)
         assert success
         
         # Verify plugin is registered
         assert "test_insurance" in registry.plugins
         assert "test_insurance" in registry.metadata
     
-    def test_get_plugin(self):
+    def test_get_plugin(self, insurance_adapter, registry):
         """Test retrieving a plugin"""
-        registry = PluginRegistry()
-        
-        plugin = InsuranceAdapter(config={
-            "system_id": "test",
-            "base_url": "https://test.com",
-            "api_key": "test-key",
-            "payer_id": "TEST-001"
-        })
-        
-        registry.register_plugin("test_insurance", plugin)
+        registry.register_plugin("test_insurance", insurance_adapter)
         
         # Get plugin
         retrieved = registry.get_plugin("test_insurance")
         assert retrieved is not None
-        assert retrieved == plugin
+        assert retrieved == insurance_adapter
     
-    def test_get_plugins_by_type(self):
+    def test_get_plugins_by_type(self, insurance_adapter, registry):
         """Test filtering plugins by type"""
-        registry = PluginRegistry()
-        
         # Register adapter plugin
-        adapter = InsuranceAdapter(config={
-            "system_id": "test",
-            "base_url": "https://test.com",
-            "api_key": "test-key",
-            "payer_id": "TEST-001"
-        })
-        registry.register_plugin("adapter", adapter)
+        registry.register_plugin("adapter", insurance_adapter)
         
         # Register workflow plugin
         workflow = ClaimsAutomationPlugin()
@@ -72,17 +54,15 @@ class TestPluginRegistry:
         # Get adapters
         adapters = registry.get_plugins_by_type(PluginType.ADAPTER)
         assert len(adapters) == 1
-        assert adapters[0] == adapter
+        assert adapters[0] == insurance_adapter
         
         # Get workflows
         workflows = registry.get_plugins_by_type(PluginType.WORKFLOW)
         assert len(workflows) == 1
         assert workflows[0] == workflow
     
-    def test_list_plugins(self):
+    def test_list_plugins(self, registry):
         """Test listing all plugins"""
-        registry = PluginRegistry()
-        
         plugin1 = InsuranceAdapter(config={
             "system_id": "test1",
             "base_url": "https://test.com",
@@ -103,19 +83,18 @@ class TestPluginRegistry:
         assert len(plugins) == 2
         assert "plugin1" in plugins
         assert "plugin2" in plugins
-    
-    def test_unregister_plugin(self):
-        """Test unregistering a plugin"""
-        registry = PluginRegistry()
         
-        plugin = InsuranceAdapter(config={
-            "system_id": "test",
-            "base_url": "https://test.com",
-            "api_key": "test-key",
-            "payer_id": "TEST-001"
-        })
+        # The listing is a read-only view
+        with pytest.raises(TypeError):
+            plugins["plugin3"] = plugins["plugin1"]
         
-        registry.register_plugin("test", plugin)
+        adapters = list(registry.iter_plugins_by_type(PluginType.ADAPTER))
+        assert [plugin_id for plugin_id, _ in adapters] == ["plugin1", "plugin2"]
+        assert adapters[0][1] is plugin1
+    
+    def test_unregister_plugin(self, insurance_adapter, registry):
+        """Test unregistering a plugin"""
+        registry.register_plugin("test", insurance_adapter)
         assert "test" in registry.plugins
         
         # Unregister
@@ -123,6 +102,117 @@ class TestPluginRegistry:
         assert success
         assert "test" not in registry.plugins
         assert "test" not in registry.metadata
+    
+    def test_clear(self, insurance_adapter, registry):
+        """Test clearing drops plugins, indexes and hooks but keeps listing views valid"""
+        registry.register_plugin("test", insurance_adapter)
+        registry.register_hook("event", lambda: None)
+        listing = registry.list_plugins()
+        
+        registry.clear()
+        
+        assert not registry.plugins
+        assert len(listing) == 0
+        assert registry.get_plugins_by_type(PluginType.ADAPTER) == []
+        assert registry.register_plugin("test", insurance_adapter)
+    
+    @pytest.mark.asyncio
+    async def test_unregister_plugin_inside_event_loop(self, registry):
+        """Test cleanup scheduled by unregister runs to completion on the running loop"""
+        cleaned = []
+        
+        class TrackingPlugin(Plugin):
+            def get_metadata(self) -> PluginMetadata:
+                return PluginMetadata(
+                    name="Tracking",
+                    version="1.0.0",
+                    plugin_type=PluginType.NOTIFIER,
+                    description="Test plugin"
+                )
+            
+            async def initialize(self) -> bool:
+                return True
+            
+            async def cleanup(self) -> bool:
+                cleaned.append(True)
+                return True
+        
+        registry.register_plugin("tracking", TrackingPlugin())
+        
+        assert registry.unregister_plugin("tracking")
+        await asyncio.gather(*registry._pending_cleanups)
+        await asyncio.sleep(0)
+        
+        assert cleaned == [True]
+        assert not registry._pending_cleanups
+    
+    @pytest.mark.asyncio
+    async def test_trigger_hook(self, registry):
+        """Test sync and async hook callbacks both run and failures are skipped"""
+        async def async_callback(value):
+            return value * 2
+        
+        async def failing_callback(value):
+            raise RuntimeError("boom")
+        
+        registry.register_hook("event", lambda value: value + 1)
+        registry.register_hook("event", async_callback)
+        registry.register_hook("event", failing_callback)
+        
+        results = await registry.trigger_hook("event", 5)
+        assert results == [6, 10]
+        assert await registry.trigger_hook("unknown", 5) == []
+        
+        # Results and sync/async interleaving follow registration order
+        calls = []
+        
+        async def async_step(value):
+            calls.append("async")
+            return "async"
+        
+        def sync_step(value):
+            calls.append("sync")
+            return "sync"
+        
+        registry.register_hook("ordered", async_step)
+        registry.register_hook("ordered", sync_step)
+        assert await registry.trigger_hook("ordered", 1) == ["async", "sync"]
+        assert calls == ["async", "sync"]
+        
+        # Callbacks registering more hooks do not affect the running trigger
+        registry.register_hook("grow", lambda: registry.register_hook("grow", lambda: "late"))
+        assert len(await registry.trigger_hook("grow")) == 1
+    
+    @pytest.mark.asyncio
+    async def test_initialize_all_isolates_failures(self, registry):
+        """Test one failing plugin does not stop the others from initializing"""
+        
+        class FlakyPlugin(Plugin):
+            def get_metadata(self) -> PluginMetadata:
+                return PluginMetadata(
+                    name=self.config["name"],
+                    version="1.0.0",
+                    plugin_type=PluginType.NOTIFIER,
+                    description="Test plugin"
+                )
+            
+            async def initialize(self) -> bool:
+                if self.config["fail"]:
+                    raise RuntimeError("init failed")
+                return True
+            
+            async def cleanup(self) -> bool:
+                return True
+        
+        registry.register_plugin("ok", FlakyPlugin({"name": "ok", "fail": False}))
+        registry.register_plugin("bad", FlakyPlugin({"name": "bad", "fail": True}))
+        
+        results = await registry.initialize_all()
+        assert results == {"ok": True, "bad": False}
+        assert registry.get_plugin("ok").initialized
+        assert not registry.get_plugin("bad").initialized
+        
+        await registry.cleanup_all()
 
 
 class TestPluginManager:
@@ -160,6 +250,40 @@ class TestPluginManager:
         plugins = manager.list_plugins()
         assert len(plugins) == 1
     
+    def test_disabled_hint_skips_instantiation(self):
+        """Test plugins hinted as disabled are never constructed"""
+        constructed = []
+        
+        class DisabledPlugin(Plugin):
+            @classmethod
+            def metadata_hint(cls):
+                return False, PluginType.NOTIFIER, 100
+            
+            def __init__(self, config=None):
+                super().__init__(config)
+                constructed.append(self)
+            
+            def get_metadata(self) -> PluginMetadata:
+                return PluginMetadata(
+                    name="Disabled",
+                    version="1.0.0",
+                    plugin_type=PluginType.NOTIFIER,
+                    description="Test plugin",
+                    enabled=False
+                )
+            
+            async def initialize(self) -> bool:
+                return True
+            
+            async def cleanup(self) -> bool:
+                return True
+        
+        manager = PluginManager()
+        
+        assert manager.load_plugin(DisabledPlugin, "disabled") is False
+        assert constructed == []
+        assert manager.get_plugin("disabled") is None
+    
     def test_list_plugins_by_type(self):
         """Test filtering plugins by type through manager"""
         manager = PluginManager()
@@ -181,132 +305,351 @@ class TestPluginManager:
         
         workflows = manager.list_plugins(plugin_type=PluginType.WORKFLOW)
         assert len(workflows) == 1
+        assert manager.registry.get_plugin_ids_by_type(PluginType.WORKFLOW) == ["workflow"]
+        assert manager.list_plugins(plugin_type=PluginType.NOTIFIER) == []
 
 
 class TestInsurancePlugin:
     """Test insurance adapter plugin"""
     
-    def test_metadata(self):
+    def test_metadata(self, insurance_adapter):
         """Test insurance plugin metadata"""
-        plugin = InsuranceAdapter(config={
-            "system_id": "test",
-            "base_url": "https://test.com",
-            "api_key": "key",
-            "payer_id": "TEST"
-        })
-        
-        metadata = plugin.get_metadata()
+        metadata = insurance_adapter.get_metadata()
         assert metadata.name == "Insurance Adapter"
         assert metadata.plugin_type == PluginType.ADAPTER
         assert metadata.version == "1.0.0"
+        
+        # Metadata is built once and shared by every instance
+        assert insurance_adapter.get_metadata() is metadata
+        other = InsuranceAdapter(config={"system_id": "other", "payer_id": "OTHER"})
+        assert other.get_metadata() is metadata
+        assert InsuranceAdapter.metadata_hint() == (True, PluginType.ADAPTER, 100)
+        
+        # Shared metadata cannot be changed by callers
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            metadata.enabled = False
     
     @pytest.mark.asyncio
-    async def test_initialize(self):
+    async def test_initialize(self, insurance_adapter):
         """Test insurance plugin initialization"""
-        plugin = InsuranceAdapter(config={
-            "system_id": "test",
-            "base_url": "https://test.com",
-            "api_key": "key",
-            "payer_id": "TEST"
-        })
-        
-        success = await plugin.initialize()
+        success = await insurance_adapter.initialize()
         assert success
     
     @pytest.mark.asyncio
-    async def test_fetch_claims(self):
+    async def test_fetch_claims(self, initialized_plugins):
         """Test fetching claims"""
-        plugin = InsuranceAdapter(config={
-            "system_id": "test",
-            "base_url": "https://test.com",
-            "api_key": "key",
-            "payer_id": "TEST"
-        })
-        
-        await plugin.initialize()
-        
-        claims = await plugin.fetch_data("Claim", {"claim_id": "CLM-001"})
+        claims = await initialized_plugins["insurance"].fetch_data("Claim", {"claim_id": "CLM-001"})
         assert len(claims) > 0
         assert claims[0]["resourceType"] == "Claim"
+    
+    @pytest.mark.asyncio
+    async def test_fetch_coverage_uses_payer(self, insurance_adapter):
+        """Test coverage references the configured payer"""
+        await insurance_adapter.initialize()
+        
+        coverage = await insurance_adapter.fetch_data("Coverage", {"patient_id": "123"})
+        assert coverage[0]["payor"] == [{"reference": "Organization/TEST"}]
+        assert coverage[0]["beneficiary"] == {"reference": "Patient/123"}
+        
+        await insurance_adapter.cleanup()
+    
+    @pytest.mark.asyncio
+    async def test_pooled_http_client_lifecycle(self, insurance_adapter):
+        """Test one pooled client is opened on initialize and closed on cleanup"""
+        assert insurance_adapter.config["payer_id"] == "TEST"
+        assert insurance_adapter.http_client is None
+        
+        await insurance_adapter.initialize()
+        client = insurance_adapter.http_client
+        assert str(client.base_url) == "https://test.com"
+        
+        await insurance_adapter.cleanup()
+        assert insurance_adapter.http_client is None
+        assert client.is_closed
+    
+    @pytest.mark.asyncio
+    async def test_request_json_round_trip(self, insurance_adapter):
+        """Test JSON requests on the pooled client encode and decode FHIR bodies"""
+        with pytest.raises(RuntimeError):
+            await insurance_adapter._request_json("GET", "/Coverage")
+        
+        def handler(request):
+            assert request.headers["Content-Type"] == "application/fhir+json"
+            claim = orjson.loads(request.content)
+            return httpx.Response(201, content=orjson.dumps({"id": "c-1", **claim}))
+        
+        insurance_adapter._client = httpx.AsyncClient(
+            base_url="https://test.com",
+            headers={"Content-Type": "application/fhir+json"},
+            transport=httpx.MockTransport(handler)
+        )
+        
+        result = await insurance_adapter._request_json("POST", "/Claim", {"resourceType": "Claim"})
+        assert result == {"id": "c-1", "resourceType": "Claim"}
+        
+        await insurance_adapter.cleanup()
+    
+    @pytest.mark.asyncio
+    async def test_request_json_retries_transient_errors(self):
+        """Test 429/5xx responses are retried while other client errors are not"""
+        plugin = InsuranceAdapter(config={"system_id": "test", "payer_id": "TEST"})
+        statuses = {"/Coverage": [503, 429, 200], "/Claim": [400, 200]}
+        seen = []
+        
+        def handler(request):
+            seen.append(request.url.path)
+            return httpx.Response(statuses[request.url.path].pop(0), json={})
+        
+        plugin._client = httpx.AsyncClient(base_url="https://test.com",
+                                           transport=httpx.MockTransport(handler))
+        
+        assert await plugin._request_json("GET", "/Coverage") == {}
+        assert seen.count("/Coverage") == 3
+        
+        with pytest.raises(httpx.HTTPStatusError):
+            await plugin._request_json("POST", "/Claim", {})
+        assert seen.count("/Claim") == 1
+        
+        await plugin.cleanup()
+    
+    @pytest.mark.asyncio
+    async def test_stream_ndjson(self):
+        """Test NDJSON exports are parsed one resource per line"""
+        plugin = InsuranceAdapter(config={"system_id": "test", "payer_id": "TEST"})
+        body = b'{"resourceType":"Coverage","id":"1"}\n\n{"resourceType":"Coverage","id":"2"}\n'
+        
+        def handler(request):
+            assert request.headers["Accept"] == "application/fhir+ndjson"
+            return httpx.Response(200, content=body)
+        
+        plugin._client = httpx.AsyncClient(base_url="https://test.com",
+                                           transport=httpx.MockTransport(handler))
+        
+        ids = [resource["id"] async for resource in plugin._stream_ndjson("/Coverage/$export")]
+        assert ids == ["1", "2"]
+        
+        # Adapters without a streaming endpoint iterate over fetch_data()
+        coverage = [c async for c in plugin.stream_data("Coverage", {"patient_id": "123"})]
+        assert coverage == await plugin.fetch_data("Coverage", {"patient_id": "123"})
+        
+        await plugin.cleanup()
 
 
 class TestGovernmentPlugin:
     """Test government adapter plugin"""
     
-    def test_metadata(self):
+    def test_metadata(self, government_adapter):
         """Test government plugin metadata"""
-        plugin = GovernmentAdapter(config={
-            "system_id": "test",
-            "agency_type": "public_health",
-            "base_url": "https://test.com",
-            "jurisdiction": "CA"
-        })
-        
-        metadata = plugin.get_metadata()
+        metadata = government_adapter.get_metadata()
         assert metadata.name == "Government Adapter"
         assert metadata.plugin_type == PluginType.ADAPTER
+        
+        # Adapters use a fixed slot layout instead of a per-instance __dict__
+        assert not hasattr(government_adapter, "__dict__")
+        with pytest.raises(AttributeError):
+            government_adapter.unexpected = True
     
     @pytest.mark.asyncio
-    async def test_initialize(self):
+    async def test_initialize(self, government_adapter):
         """Test government plugin initialization"""
+        success = await government_adapter.initialize()
+        assert success
+    
+    @pytest.mark.asyncio
+    async def test_bulk_operations(self):
+        """Test bulk fetch and send return one result per input in order"""
         plugin = GovernmentAdapter(config={
             "system_id": "test",
-            "agency_type": "public_health",
+            "agency_type": "state_registry",
             "base_url": "https://test.com",
             "jurisdiction": "CA"
         })
+        await plugin.initialize()
         
-        success = await plugin.initialize()
-        assert success
+        results = await plugin.fetch_data_bulk("Immunization",
+                                               [{"patient_id": "1"}, {"patient_id": "2"}])
+        assert [r[0]["patient"]["reference"] for r in results] == ["Patient/1", "Patient/2"]
+        
+        sent = await plugin.send_data_bulk("Immunization", [
+            {"vaccineCode": "MMR", "patient": "Patient/1"},
+            {"vaccineCode": "MMR"},
+        ])
+        assert sent == [True, False]
+        
+        # Unsupported batch types fall back to per-record sends
+        assert await plugin.send_data_bulk("Unknown", [{}]) == [False]
+    
+    @pytest.mark.asyncio
+    async def test_forecast_immunizations(self):
+        """Test forecasting skips vaccines already given"""
+        plugin = ImmunizationRegistryPlugin()
+        
+        history = [{"vaccineCode": "MMR"}, {"vaccineCode": "Influenza"}]
+        recommendations = await plugin.forecast_immunizations("Patient/123", history)
+        
+        assert [r["vaccine"] for r in recommendations] == ["COVID-19", "Tetanus"]
+        assert all(r["patient"] == "Patient/123" for r in recommendations)
+        
+        # FHIR CodeableConcepts, as returned by the registry, are matched too
+        registry_records = await GovernmentAdapter(config={
+            "system_id": "test_gov",
+            "agency_type": "public_health",
+            "base_url": "https://test.gov",
+            "jurisdiction": "CA"
+        }).fetch_data("Immunization", {"patient_id": "123"})
+        history = registry_records + [
+            {"vaccineCode": {"text": "Tetanus"}},
+            {"vaccineCode": {"coding": [{"system": "http://hl7.org/fhir/sid/cvx",
+                                         "code": "03", "display": "MMR"}]}}
+        ]
+        recommendations = await plugin.forecast_immunizations("Patient/123", history)
+        
+        assert [r["vaccine"] for r in recommendations] == ["COVID-19", "Influenza"]
 
 
 class TestProviderPlugin:
     """Test provider adapter plugin"""
     
-    def test_metadata(self):
+    def test_metadata(self, provider_adapter):
         """Test provider plugin metadata"""
-        plugin = ProviderAdapter(config={
-            "system_id": "test",
-            "ehr_type": "epic",
-            "base_url": "https://test.com",
-            "client_id": "client",
-            "client_secret": "secret"
-        })
-        
-        metadata = plugin.get_metadata()
+        metadata = provider_adapter.get_metadata()
         assert metadata.name == "Provider Adapter"
         assert metadata.plugin_type == PluginType.ADAPTER
     
     @pytest.mark.asyncio
-    async def test_initialize(self):
+    async def test_initialize(self, provider_adapter):
         """Test provider plugin initialization"""
-        plugin = ProviderAdapter(config={
+        success = await provider_adapter.initialize()
+        assert success
+    
+    @pytest.mark.asyncio
+    async def test_fetch_patients(self, initialized_plugins):
+        """Test fetching patients"""
+        provider_adapter = initialized_plugins["provider"]
+        
+        patients = await provider_adapter.fetch_data("Patient", {"patient_id": "12345"})
+        assert len(patients) > 0
+        assert patients[0]["resourceType"] == "Patient"
+        
+        # Each call fills a fresh resource from the shared template
+        other = await provider_adapter.fetch_data("Patient", {"patient_id": "67890"})
+        assert patients[0]["id"] == "12345"
+        assert other[0]["id"] == "67890"
+        assert other[0] is not patients[0]
+        
+        # Results share no nested parts, so changing one leaves the others intact
+        labs = await provider_adapter.fetch_data("Observation", {"patient_id": "12345"})
+        labs[0]["code"]["coding"].append({"code": "extra"})
+        labs[0]["category"][0]["coding"][0]["code"] = "vital-signs"
+        more_labs = await provider_adapter.fetch_data("Observation", {"patient_id": "67890"})
+        assert len(more_labs[0]["code"]["coding"]) == 1
+        assert more_labs[0]["category"][0]["coding"][0]["code"] == "laboratory"
+    
+    @pytest.mark.asyncio
+    async def test_resource_handlers_extensible(self):
+        """Test subclasses can add resource handlers and unknown types are rejected"""
+        
+        class ImagingProviderAdapter(ProviderAdapter):
+            _FETCH_HANDLERS = {**ProviderAdapter._FETCH_HANDLERS,
+                               "ImagingStudy": "_fetch_imaging"}
+            
+            async def _fetch_imaging(self, params):
+                return [{"resourceType": "ImagingStudy", "id": params["study_id"]}]
+        
+        plugin = ImagingProviderAdapter(config={"system_id": "test"})
+        
+        studies = await plugin.fetch_data("ImagingStudy", {"study_id": "1.2.3"})
+        assert studies == [{"resourceType": "ImagingStudy", "id": "1.2.3"}]
+        assert (await plugin.fetch_data("Patient", {"patient_id": "1"}))[0]["id"] == "1"
+        assert await plugin.fetch_data("Unknown", {}) == []
+        assert await plugin.send_data("Unknown", {}) is False
+    
+    @pytest.mark.asyncio
+    async def test_fetch_data_bulk_bounded_concurrency(self):
+        """Test bulk fetches respect max_concurrency and isolate failures"""
+        active = 0
+        peak = 0
+        
+        # Adapters are slotted, so instrument fetch_data through a subclass
+        class TrackingProviderAdapter(ProviderAdapter):
+            async def fetch_data(self, resource_type, params):
+                nonlocal active, peak
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+                if params["patient_id"] == "bad":
+                    raise RuntimeError("upstream error")
+                return await super().fetch_data(resource_type, params)
+        
+        plugin = TrackingProviderAdapter(config={
             "system_id": "test",
             "ehr_type": "epic",
             "base_url": "https://test.com",
             "client_id": "client",
-            "client_secret": "secret"
+            "client_secret": "secret",
+            "max_concurrency": 2
         })
+        await plugin.initialize()
         
-        success = await plugin.initialize()
-        assert success
+        ids = ["1", "2", "bad", "4", "5"]
+        results = await plugin.fetch_data_bulk("Patient", [{"patient_id": i} for i in ids])
+        
+        assert peak == 2
+        assert isinstance(results[2], RuntimeError)
+        assert [r[0]["id"] for i, r in enumerate(results) if i != 2] == ["1", "2", "4", "5"]
+        
+        await plugin.cleanup()
     
     @pytest.mark.asyncio
-    async def test_fetch_patients(self):
-        """Test fetching patients"""
-        plugin = ProviderAdapter(config={
+    async def test_fetch_cache_single_flight(self):
+        """Test slow-changing resources are cached and concurrent misses coalesce"""
+        calls = []
+        
+        class CountingProviderAdapter(ProviderAdapter):
+            async def _fetch_patients(self, params):
+                calls.append(("Patient", params["patient_id"]))
+                await asyncio.sleep(0.01)
+                return await super()._fetch_patients(params)
+            
+            async def _fetch_observations(self, params):
+                calls.append(("Observation", params["patient_id"]))
+                await asyncio.sleep(0.01)
+                return await super()._fetch_observations(params)
+        
+        plugin = CountingProviderAdapter(config={
             "system_id": "test",
             "ehr_type": "epic",
             "base_url": "https://test.com",
             "client_id": "client",
             "client_secret": "secret"
         })
-        
         await plugin.initialize()
         
-        patients = await plugin.fetch_data("Patient", {"patient_id": "12345"})
-        assert len(patients) > 0
-        assert patients[0]["resourceType"] == "Patient"
+        results = await asyncio.gather(*(plugin.fetch_data("Patient", {"patient_id": "1"})
+                                         for _ in range(5)))
+        assert all(result == results[0] for result in results)
+        assert await plugin.fetch_data("Patient", {"patient_id": "1"}) == results[0]
+        assert calls == [("Patient", "1")]
+        
+        # Callers get their own copies, so changing one leaves the cache intact
+        results[0].append({"resourceType": "Patient", "id": "extra"})
+        results[1][0]["name"] = "MUTATED"
+        assert await plugin.fetch_data("Patient", {"patient_id": "1"}) == results[2]
+        assert results[2][0]["name"] != "MUTATED"
+        
+        # Clinical observations always go upstream, but identical concurrent
+        # fetches still share one call
+        await plugin.fetch_data("Observation", {"patient_id": "1"})
+        await plugin.fetch_data("Observation", {"patient_id": "1"})
+        assert calls.count(("Observation", "1")) == 2
+        
+        await asyncio.gather(*(plugin.fetch_data("Observation", {"patient_id": "2"})
+                               for _ in range(5)))
+        assert calls.count(("Observation", "2")) == 1
+        assert len(plugin._inflight) == 0
+        
+        await plugin.cleanup()
 
 
 class TestWorkflowPlugins:
@@ -329,6 +672,62 @@ class TestWorkflowPlugins:
         result = await plugin.process_claim(claim_data)
         assert result["valid"] is True
         assert len(result["errors"]) == 0
+        
+        await plugin.cleanup()
+    
+    @pytest.mark.asyncio
+    async def test_claims_batch_submission(self):
+        """Test concurrent claims are coalesced into batches with per-claim results"""
+        plugin = ClaimsAutomationPlugin(config={"max_batch": 2, "max_wait_ms": 5})
+        await plugin.initialize()
+        
+        flushed = []
+        submit_batch = plugin._batcher.handler
+        
+        async def recording_submit_batch(claims):
+            flushed.append(len(claims))
+            return await submit_batch(claims)
+        
+        plugin._batcher.handler = recording_submit_batch
+        
+        valid = {
+            "patient": "Patient/123",
+            "provider": "Org/456",
+            "diagnosis": [{"code": "E11.9"}],
+            "serviceDate": "2024-01-15"
+        }
+        results = await plugin.process_claims_batch([valid, {"patient": "Patient/1"}, valid])
+        
+        assert [r["submitted"] for r in results] == [True, False, True]
+        assert results[1]["errors"][0] == "Missing required field: provider"
+        assert flushed == [2, 1]
+        
+        await plugin.cleanup()
+        
+        # Without the background drainer claims are submitted directly
+        result = await plugin.submit_claim(valid)
+        assert result["submitted"] is True
+    
+    @pytest.mark.asyncio
+    async def test_claims_in_flight_submitted_on_cleanup(self):
+        """Test claims still being batched are submitted when the plugin is cleaned up"""
+        plugin = ClaimsAutomationPlugin(config={"max_batch": 10, "max_wait_ms": 100})
+        await plugin.initialize()
+        
+        valid = {
+            "patient": "Patient/123",
+            "provider": "Org/456",
+            "diagnosis": [{"code": "E11.9"}],
+            "serviceDate": "2024-01-15"
+        }
+        in_flight = asyncio.ensure_future(plugin.process_claims_batch([valid, valid]))
+        
+        # Let the drainer take the claims and start holding their batch open
+        await asyncio.sleep(0.01)
+        await asyncio.wait_for(plugin.cleanup(), timeout=1)
+        
+        results = await asyncio.wait_for(in_flight, timeout=1)
+        assert [r["submitted"] for r in results] == [True, True]
     
     @pytest.mark.asyncio
     async def test_public_health_reporting(self):
@@ -340,6 +739,7 @@ class TestWorkflowPlugins:
         # Test reportable condition detection
         assert plugin.is_reportable("COVID-19") is True
         assert plugin.is_reportable("Common Cold") is False
+        assert plugin.is_reportable("acute hepatitis B") is True
         
         # Test report generation
         patient_data = {"id": "Patient/123", "provider": "Dr. Smith"}
@@ -365,3 +765,151 @@ class TestWorkflowPlugins:
         
         assert referral["resourceType"] == "ServiceRequest"
         assert referral["specialty"] == "Cardiology"
+        assert referral["reasonCode"] == [{"text": "Abnormal ECG"}]
+        
+        with pytest.raises(ValueError):
+            await plugin.create_referral({"name": "No Id"}, "Cardiology", "Abnormal ECG")
+        with pytest.raises(ValueError):
+            await plugin.create_referral(patient_data, "", "Abnormal ECG")
+    
+    @pytest.mark.asyncio
+    async def test_appointment_reminders_batched(self):
+        """Test concurrent reminders go out in one gateway batch"""
+        plugin = PatientEngagementPlugin(config={"reminder_max_wait_ms": 5})
+        await plugin.initialize()
+        
+        batches = []
+        send_batch = plugin._reminders.handler
+        
+        async def recording_send_batch(reminders):
+            batches.append([patient_id for patient_id, _ in reminders])
+            return await send_batch(reminders)
+        
+        plugin._reminders.handler = recording_send_batch
+        
+        appointment = {"start": "2024-02-01T09:00:00Z"}
+        sent = await asyncio.gather(*(plugin.send_appointment_reminder(pid, appointment)
+                                      for pid in ("p1", "p2", "p3")))
+        
+        assert sent == [True, True, True]
+        assert batches == [["p1", "p2", "p3"]]
+        
+        await plugin.cleanup()
+    
+    @pytest.mark.asyncio
+    async def test_appointment_reminders_flushed_on_cleanup(self):
+        """Test reminders still queued or in a batch being filled are sent on cleanup"""
+        plugin = PatientEngagementPlugin(config={"reminder_batch_size": 10,
+                                                 "reminder_max_wait_ms": 100})
+        await plugin.initialize()
+        
+        appointment = {"start": "2024-02-01T09:00:00Z"}
+        pending = asyncio.ensure_future(plugin.send_appointment_reminder("p1", appointment))
+        
+        # Let the drainer take the reminder and start holding its batch open
+        await asyncio.sleep(0.01)
+        await asyncio.wait_for(plugin.cleanup(), timeout=1)
+        
+        assert await asyncio.wait_for(pending, timeout=1) is True
+    
+    @pytest.mark.asyncio
+    async def test_appointment_reminders_short_batch_result(self):
+        """Test a gateway batch returning too few results fails every reminder in it"""
+        plugin = PatientEngagementPlugin(config={"reminder_max_wait_ms": 5})
+        await plugin.initialize()
+        
+        async def short_send_batch(reminders):
+            return [True]
+        
+        plugin._reminders.handler = short_send_batch
+        
+        appointment = {"start": "2024-02-01T09:00:00Z"}
+        sent = await asyncio.wait_for(
+            asyncio.gather(*(plugin.send_appointment_reminder(pid, appointment)
+                             for pid in ("p1", "p2")), return_exceptions=True),
+            timeout=1
+        )
+        
+        assert all(isinstance(result, ValueError) for result in sent)
+        
+        await plugin.cleanup()
+    
+    @pytest.mark.asyncio
+    async def test_medication_adherence_pdc(self):
+        """Test adherence is scored from refill history without double counting"""
+        from datetime import date
+        
+        plugin = PatientEngagementPlugin()
+        medications = [
+            {
+                "id": "metformin",
+                # Second fill overlaps the first by 10 days
+                "fills": [
+                    {"date": "2024-01-01", "daysSupply": 30},
+                    {"date": "2024-01-21", "daysSupply": 30},
+                    {"date": "2024-03-01", "daysSupply": 30}
+                ]
+            },
+            {
+                "id": "statin",
+                "fills": [{"date": "2024-01-01", "daysSupply": 30}]
+            },
+            {"id": "no-history"}
+        ]
+        
+        report = await plugin.check_medication_adherence("12345", medications,
+                                                         as_of=date(2024, 3, 31))
+        
+        # Window is 90 days: metformin covers 50 + 30, statin covers 30
+        assert report["medications_tracked"] == 3
+        assert report["medications_scored"] == 2
+        assert report["adherence_score"] == pytest.approx((80 / 90 + 30 / 90) / 2)
+        assert [alert["medication"] for alert in report["alerts"]] == ["statin"]
+
+
+class TestPluginOrdering:
+    """Test priority ordering of registered plugins"""
+    
+    def test_get_plugins_by_type_sorted_by_priority(self, registry):
+        """Test plugins of a type come back lowest priority number first"""
+        
+        class PriorityPlugin(Plugin):
+            def get_metadata(self) -> PluginMetadata:
+                return PluginMetadata(
+                    name=self.config["name"],
+                    version="1.0.0",
+                    plugin_type=PluginType.NOTIFIER,
+                    description="Test plugin",
+                    priority=self.config["priority"]
+                )
+            
+            async def initialize(self) -> bool:
+                return True
+            
+            async def cleanup(self) -> bool:
+                return True
+        
+        registry.register_plugin("low", PriorityPlugin({"name": "low", "priority": 200}))
+        registry.register_plugin("high", PriorityPlugin({"name": "high", "priority": 10}))
+        registry.register_plugin("mid", PriorityPlugin({"name": "mid", "priority": 100}))
+        
+        names = [p.config["name"] for p in registry.get_plugins_by_type(PluginType.NOTIFIER)]
+        assert names == ["high", "mid", "low"]
+        
+        registry.unregister_plugin("high")
+        names = [p.config["name"] for p in registry.get_plugins_by_type(PluginType.NOTIFIER)]
+        assert names == ["mid", "low"]
+    
+    def test_discover_plugins_reuses_cached_scan(self):
+        """Test discovery caches plugin classes and skips re-exported ones"""
+        from pyheart.core.plugins import _DISCOVERY_CACHE
+        
+        registry = PluginRegistry()
+        count = registry.discover_plugins("pyheart.plugins")
+        
+        assert count == 8
+        assert "pyheart.plugins" in _DISCOVERY_CACHE
+        
+        second = PluginRegistry()
+        assert second.discover_plugins("pyheart.plugins") == count
+        assert set(second.plugins) == set(registry.plugins)
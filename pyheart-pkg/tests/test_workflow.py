@@ -1,8 +1,12 @@
 """Tests for workflow engine."""
 
+import sys
 import pytest
 import asyncio
-from pyheart.core.workflow import WorkflowEngine, ProcessDefinition, Task, TaskType
+from pyheart.core.workflow import (
+    WorkflowEngine, ProcessDefinition, Task, TaskType, TaskResult, TaskStatus,
+    get_workflow_engine
+)
 
 
 def test_workflow_engine_initialization():
@@ -127,6 +131,10 @@ def test_variable_substitution():
     
     result = engine._substitute_variables(template, variables)
     assert result == "Hello John, your age is 30"
+    
+    # Unknown placeholders are left untouched
+    result = engine._substitute_variables("${name} has ${unknown}", variables)
+    assert result == "John has ${unknown}"
 
 
 def test_condition_evaluation():
@@ -141,4 +149,197 @@ def test_condition_evaluation():
     
     variables = {"age": 30}
     result = engine._evaluate_condition(condition, variables)
-    assert result is False
\ No newline at end of file
+    assert result is False
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots require Python 3.10+")
+def test_task_result_uses_slots():
+    """Test task results carry no per-instance __dict__."""
+    result = TaskResult(status=TaskStatus.COMPLETED)
+    assert not hasattr(result, "__dict__")
+    assert result.status == TaskStatus.COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_instance_task_status_counts():
+    """Test packed task status counters on a workflow instance."""
+    engine = WorkflowEngine()
+    
+    process = ProcessDefinition(
+        id="counted-workflow",
+        name="Counted Workflow",
+        tasks=[
+            Task(id="first", name="First Task", type=TaskType.NOTIFICATION),
+            Task(id="second", name="Second Task", type=TaskType.HUMAN_TASK),
+            Task(id="third", name="Third Task", type=TaskType.NOTIFICATION,
+                 dependencies=["second"])
+        ]
+    )
+    
+    engine.register_process(process)
+    instance_id = await engine.start_process("counted-workflow")
+    
+    # Wait for execution
+    await asyncio.sleep(0.1)
+    
+    # The failed second task stops the instance before the third runs
+    instance = engine.get_instance_status(instance_id)
+    assert instance.count_tasks(TaskStatus.COMPLETED) == 1
+    assert instance.count_tasks(TaskStatus.FAILED) == 1
+    assert instance.count_tasks(TaskStatus.PENDING) == 1
+    assert instance.has_failed_tasks()
+    assert instance.status is TaskStatus.FAILED
+    assert "third" not in instance.task_results
+
+
+@pytest.mark.asyncio
+async def test_decision_rules_compiled_at_registration():
+    """Test decision rules are compiled once and applied to instances."""
+    engine = WorkflowEngine()
+    
+    process = ProcessDefinition(
+        id="decision-workflow",
+        name="Decision Workflow",
+        tasks=[
+            Task(
+                id="triage",
+                name="Triage",
+                type=TaskType.DECISION,
+                config={"rules": [{
+                    "condition": {"operator": "gt", "left": "$risk", "right": "0.8"},
+                    "actions": [{"type": "set_variable", "variable": "priority", "value": "high"}]
+                }]}
+            )
+        ]
+    )
+    
+    engine.register_process(process)
+    assert ("decision-workflow", "triage") in engine._decision_rules
+    
+    instance_id = await engine.start_process("decision-workflow", {"risk": 0.9})
+    
+    # Wait for execution
+    await asyncio.sleep(0.1)
+    
+    instance = engine.get_instance_status(instance_id)
+    assert instance.variables["priority"] == "high"
+    assert instance.task_results["triage"].output is True
+
+
+@pytest.mark.asyncio
+async def test_cancel_instance():
+    """Test cancelling a running workflow instance."""
+    engine = WorkflowEngine()
+    
+    process = ProcessDefinition(
+        id="cancel-workflow",
+        name="Cancel Workflow",
+        tasks=[Task(id="notify", name="Notify", type=TaskType.NOTIFICATION)]
+    )
+    
+    engine.register_process(process)
+    instance_id = await engine.start_process("cancel-workflow")
+    instance = engine.get_instance_status(instance_id)
+    
+    # Not running yet, so nothing to cancel
+    assert engine.cancel_instance(instance_id) is False
+    assert not instance.is_finished()
+    
+    instance.status = TaskStatus.RUNNING
+    assert engine.cancel_instance(instance_id) is True
+    assert instance.status is TaskStatus.CANCELLED
+    assert instance.is_finished()
+
+
+def test_get_workflow_engine_is_shared():
+    """Test the global workflow engine is created once and reused."""
+    assert get_workflow_engine() is get_workflow_engine()
+
+
+def test_register_process_rejects_unknown_action():
+    """Test decision rules with unregistered action types fail at registration."""
+    engine = WorkflowEngine()
+    
+    process = ProcessDefinition(
+        id="bad-action-workflow",
+        name="Bad Action Workflow",
+        tasks=[
+            Task(
+                id="triage",
+                name="Triage",
+                type=TaskType.DECISION,
+                config={"rules": [{
+                    "condition": {"operator": "eq", "left": "$a", "right": "b"},
+                    "actions": [{"type": "launch_rocket"}]
+                }]}
+            )
+        ]
+    )
+    
+    with pytest.raises(ValueError):
+        engine.register_process(process)
+    assert "bad-action-workflow" not in engine.processes
+
+
+def test_register_process_rejects_unknown_nested_action():
+    """Test unregistered action types inside nested sub-tasks fail at registration."""
+    engine = WorkflowEngine()
+    
+    process = ProcessDefinition(
+        id="nested-bad-action-workflow",
+        name="Nested Bad Action Workflow",
+        tasks=[
+            Task(
+                id="fan-out",
+                name="Fan Out",
+                type=TaskType.PARALLEL,
+                config={"tasks": [{
+                    "id": "triage",
+                    "name": "Triage",
+                    "type": "decision",
+                    "config": {"rules": [{
+                        "condition": {"operator": "eq", "left": "$a", "right": "b"},
+                        "actions": [{"type": "launch_rocket"}]
+                    }]}
+                }]}
+            )
+        ]
+    )
+    
+    with pytest.raises(ValueError):
+        engine.register_process(process)
+
+
+@pytest.mark.asyncio
+async def test_call_api_action():
+    """Test call_api decision actions are registered and run."""
+    engine = WorkflowEngine()
+    
+    process = ProcessDefinition(
+        id="dispatch-workflow",
+        name="Dispatch Workflow",
+        tasks=[
+            Task(
+                id="allocate",
+                name="Allocate Resources",
+                type=TaskType.DECISION,
+                config={"rules": [{
+                    "condition": {"operator": "eq", "left": "$triage_level", "right": "critical"},
+                    "actions": [
+                        {"type": "call_api", "endpoint": "/emergency/dispatch-team"},
+                        {"type": "set_variable", "variable": "response_time", "value": "immediate"}
+                    ]
+                }]}
+            )
+        ]
+    )
+    
+    engine.register_process(process)
+    instance_id = await engine.start_process("dispatch-workflow", {"triage_level": "critical"})
+    
+    # Wait for execution
+    await asyncio.sleep(0.1)
+    
+    instance = engine.get_instance_status(instance_id)
+    assert instance.status is TaskStatus.COMPLETED
+    assert instance.variables["response_time"] == "immediate"
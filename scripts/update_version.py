@@ -8,14 +8,35 @@ import re
 import os
 from pathlib import Path
 
+# Anchored to the start of a line so keys such as minversion or
+# python_version in pyproject.toml are left alone
+VERSION_RE = re.compile(r'^version = "[^"]*"', re.MULTILINE)
+DUNDER_RE = re.compile(r'^__version__ = "[^"]*"', re.MULTILINE)
 
-def update_version_in_file(file_path: str, new_version: str, pattern: str, replacement: str):
+# X.Y.Z with an optional pre-release suffix such as -alpha.1
+_SEMVER_RE = re.compile(r'^\d+\.\d+\.\d+(-[a-zA-Z0-9]+(\.[a-zA-Z0-9]+)*)?$')
+
+# Files to update, with the compiled pattern and replacement for each
+FILES_TO_UPDATE = [
+    ('pybrain-pkg/pyproject.toml', VERSION_RE, 'version = "{version}"'),
+    ('pybrain-pkg/src/pybrain/__init__.py', DUNDER_RE, '__version__ = "{version}"'),
+    ('pyheart-pkg/pyproject.toml', VERSION_RE, 'version = "{version}"'),
+    ('pyheart-pkg/src/pyheart/__init__.py', DUNDER_RE, '__version__ = "{version}"'),
+]
+
+
+def update_version_in_file(file_path: str, new_version: str, pattern: re.Pattern, replacement: str):
     """Update version in a specific file"""
     try:
         with open(file_path, 'r') as f:
             content = f.read()
         
-        new_content = re.sub(pattern, replacement.format(version=new_version), content)
+        new_content = pattern.sub(replacement.format(version=new_version), content)
+        
+        # Leave the file (and its mtime) alone when nothing changes
+        if new_content == content:
+            print(f"⏭  {file_path} already at {new_version}")
+            return True
         
         with open(file_path, 'w') as f:
             f.write(new_content)
@@ -29,8 +50,7 @@ def update_version_in_file(file_path: str, new_version: str, pattern: str, repla
 
 def validate_version(version: str) -> bool:
     """Validate semantic version format"""
-    pattern = r'^\d+\.\d+\.\d+(-[a-zA-Z0-9]+(\.[a-zA-Z0-9]+)*)?$'
-    return bool(re.match(pattern, version))
+    return bool(_SEMVER_RE.match(version))
 
 
 def update_all_versions(new_version: str):
@@ -42,43 +62,14 @@ def update_all_versions(new_version: str):
     
     print(f"🔄 Updating version to {new_version}")
     
-    # Files to update
-    files_to_update = [
-        {
-            'path': 'pybrain-pkg/pyproject.toml',
-            'pattern': r'version = "[^"]*"',
-            'replacement': 'version = "{version}"'
-        },
-        {
-            'path': 'pybrain-pkg/src/pybrain/__init__.py',
-            'pattern': r'__version__ = "[^"]*"',
-            'replacement': '__version__ = "{version}"'
-        },
-        {
-            'path': 'pyheart-pkg/pyproject.toml',
-            'pattern': r'version = "[^"]*"',
-            'replacement': 'version = "{version}"'
-        },
-        {
-            'path': 'pyheart-pkg/src/pyheart/__init__.py',
-            'pattern': r'__version__ = "[^"]*"',
-            'replacement': '__version__ = "{version}"'
-        }
-    ]
-    
-    success_count = 0
-    for file_info in files_to_update:
-        if update_version_in_file(
-            file_info['path'],
-            new_version,
-            file_info['pattern'],
-            file_info['replacement']
-        ):
-            success_count += 1
+    success_count = sum(
+        update_version_in_file(path, new_version, pattern, replacement)
+        for path, pattern, replacement in FILES_TO_UPDATE
+    )
     
-    print(f"\n📊 Updated {success_count}/{len(files_to_update)} files")
+    print(f"\n📊 Updated {success_count}/{len(FILES_TO_UPDATE)} files")
     
-    if success_count == len(files_to_update):
+    if success_count == len(FILES_TO_UPDATE):
         print(f"🎉 All files updated successfully to version {new_version}")
         print("\n📋 Next steps:")
         print("1. Review changes: git diff")